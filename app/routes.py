@@ -1,13 +1,20 @@
-from flask import Blueprint, jsonify, request, render_template
+from flask import Blueprint, Response, jsonify, request, render_template
 from flask_jwt_extended import jwt_required, create_access_token
-import plotly.graph_objects as go
-import plotly.io as pio
 from datetime import datetime
-from .stock_data import fetch_stock_data, calculate_returns, get_stock_data
+from .stock_data import fetch_stock_data, fetch_stock_data_bulk, calculate_returns, get_stock_data, normalize_ticker
 import pandas as pd
+import numpy as np
+import orjson
+import logging
+
+logger = logging.getLogger(__name__)
 
 main_bp = Blueprint('main', __name__)
 
+def _is_ticker(value) -> bool:
+    """요청으로 받은 종목 코드가 비어 있지 않은 문자열인지 확인합니다."""
+    return isinstance(value, str) and bool(value.strip())
+
 @main_bp.route('/')
 def index():
     return render_template('index.html')
@@ -22,8 +29,9 @@ def api_fetch_stock_data():
         end_date = data.get('end_date')
         force_refresh = data.get('force_refresh', False)
         
-        if not ticker or not start_date:
+        if not _is_ticker(ticker) or not start_date:
             return jsonify({'error': 'Ticker and start_date are required'}), 400
+        ticker = normalize_ticker(ticker)
         
         success = fetch_stock_data(ticker, start_date, end_date, force_refresh=force_refresh)
         if success:
@@ -33,6 +41,28 @@ def api_fetch_stock_data():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@main_bp.route('/api/fetch-stock-data-bulk', methods=['POST'])
+def api_fetch_stock_data_bulk():
+    """여러 종목의 데이터를 한 번에 가져와서 데이터베이스에 저장합니다."""
+    try:
+        data = request.json
+        tickers = data.get('tickers')
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        
+        if not tickers or not isinstance(tickers, list) or not start_date:
+            return jsonify({'error': 'Tickers and start_date are required'}), 400
+        if not all(_is_ticker(ticker) for ticker in tickers):
+            return jsonify({'error': 'Tickers must be non-empty strings'}), 400
+        
+        results = fetch_stock_data_bulk(tickers, start_date, end_date)
+        failed = [ticker for ticker, success in results.items() if not success]
+        if failed:
+            return jsonify({'results': results, 'error': f'Failed to fetch data for {", ".join(failed)}'}), 400
+        return jsonify({'results': results, 'message': 'Data fetched and stored successfully'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @main_bp.route('/api/get-chart-data', methods=['POST'])
 def api_get_chart_data():
     """차트용 데이터를 반환합니다."""
@@ -43,8 +73,9 @@ def api_get_chart_data():
         end_date = data.get('end_date')
         force_refresh = data.get('force_refresh', False)
         
-        if not ticker or not start_date:
+        if not _is_ticker(ticker) or not start_date:
             return jsonify({'error': 'Ticker and start_date are required'}), 400
+        ticker = normalize_ticker(ticker)
         
         # 데이터 가져오기 시도
         stock_data = get_stock_data(ticker, start_date, end_date)
@@ -60,28 +91,23 @@ def api_get_chart_data():
         if stock_data.empty:
             return jsonify({'error': f'No data available for {ticker}'}), 400
         
-        # 배당금 데이터 로깅 추가
-        print(f"\n=== {ticker} 배당금 데이터 ===")
-        print("배당금이 있는 날짜:")
-        dividend_data = stock_data[stock_data['dividend'] > 0]
-        if not dividend_data.empty:
-            for idx, row in dividend_data.iterrows():
-                print(f"날짜: {idx.strftime('%Y-%m-%d')}, 배당금: ${row['dividend']:.4f}")
-        else:
-            print("배당금 데이터가 없습니다.")
-        print("========================\n")
+        # 배당금 데이터 로깅 (DEBUG 레벨에서만)
+        if logger.isEnabledFor(logging.DEBUG):
+            dividend_data = stock_data.loc[stock_data['dividend'] > 0, 'dividend']
+            logger.debug("%s dividends: %s", ticker, dividend_data.to_dict())
         
+        # NumPy 배열을 그대로 orjson으로 직렬화 (파이썬 리스트 변환 없음)
         chart_data = {
             'dates': stock_data.index.strftime('%Y-%m-%d').tolist(),
-            'prices': stock_data['close'].tolist(),
-            'volumes': stock_data['volume'].tolist(),
-            'dividends': stock_data['dividend'].tolist(),
+            'prices': np.ascontiguousarray(stock_data['close'].to_numpy()),
+            'volumes': np.ascontiguousarray(stock_data['volume'].to_numpy(dtype='int64')),
+            'dividends': np.ascontiguousarray(stock_data['dividend'].to_numpy()),
             'ticker': ticker,
             'start_date': start_date,
             'end_date': end_date
         }
         
-        return jsonify(chart_data)
+        return Response(orjson.dumps(chart_data, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
     except Exception as e:
         import traceback
         print('get-chart-data error:', traceback.format_exc())
@@ -97,8 +123,9 @@ def api_calculate_returns():
         start_date = data.get('start_date')
         end_date = data.get('end_date')
         
-        if not ticker or not start_date or investment_amount <= 0:
+        if not _is_ticker(ticker) or not start_date or investment_amount <= 0:
             return jsonify({'error': '잘못된 입력값입니다'}), 400
+        ticker = normalize_ticker(ticker)
         
         # 수익률 계산
         results = calculate_returns(ticker, investment_amount, start_date, end_date)
@@ -1,15 +1,37 @@
 import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+from curl_cffi import requests as curl_requests
 import pandas as pd
-from datetime import datetime, timedelta
-import psycopg2
-from psycopg2.extras import execute_batch
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date, datetime, timedelta, timezone
+from psycopg2.extras import execute_values
+from psycopg2.extensions import connection as PgConnection
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 import os
-import pytz
 import logging
 import time
+from collections import defaultdict
+from cachetools import TTLCache
+import diskcache
+import itertools
+import hashlib
+import io
+import csv
+import threading
+from contextlib import contextmanager
 from functools import lru_cache
-import random
+
+try:
+    from numba import njit
+except ImportError:
+    # numba가 없는 환경에서는 같은 함수를 파이썬/NumPy로 그대로 실행합니다
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 load_dotenv()
 
@@ -17,50 +39,317 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# API 요청 간 최소 대기 시간 (초)
+# 429 응답 재시도 시 첫 대기 시간 (초, 이후 2배씩 증가)
 MIN_REQUEST_DELAY = 2
-MAX_REQUEST_DELAY = 5
+
+# yfinance 요청 허용량 (토큰 버킷: 분당 30회, 최대 30회까지 몰아서 허용)
+API_RATE_LIMIT_PER_MINUTE = 30
+
+# yfinance 공용 HTTP 세션
+_yf_session = None
+_yf_session_lock = threading.Lock()
+
+# 프로세스 내 토큰 버킷 상태 (time.monotonic 기준)
+_api_bucket = {'tokens': float(API_RATE_LIMIT_PER_MINUTE), 't': time.monotonic()}
+_api_call_lock = threading.Lock()
 
 # 데이터 최신성 체크 시간 (1시간)
 DATA_FRESHNESS_HOURS = 1
 
+# multi-row INSERT 한 번에 보낼 행 수
+UPSERT_SINGLE_PAGE_ROWS = 10000
+UPSERT_PAGE_SIZE = 1000
+
+# 일괄 조회 시 yfinance가 동시에 사용하는 최대 스레드 수
+BULK_FETCH_MAX_WORKERS = 8
+
+# 이보다 많은 주가 행은 COPY + 임시 테이블로 저장
+COPY_THRESHOLD_ROWS = 500
+
+# 한 번에 이만큼 이상 적재하면 (약 20년치 일별 데이터) 적재 직후 플래너 통계 갱신
+ANALYZE_AFTER_LOAD_ROWS = 5000
+
+# stocks 테이블에 저장하는 행(tuple)의 컬럼 순서
+STOCK_TABLE_COLUMNS = ('ticker', 'date', 'open', 'high', 'low', 'close', 'volume', 'dividend', 'updated_at')
+
+# 주가/배당금/분할 upsert SQL (execute_values용, 호출마다 다시 만들지 않도록 모듈 상수로 정의)
+STOCK_UPSERT_SQL = """
+    INSERT INTO stocks (ticker, date, open, high, low, close, volume, dividend, updated_at)
+    VALUES %s
+    ON CONFLICT (ticker, date) 
+    DO UPDATE SET 
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        dividend = EXCLUDED.dividend,
+        updated_at = EXCLUDED.updated_at
+"""
+DIVIDEND_UPSERT_SQL = """
+    INSERT INTO dividends (ticker, date, amount, updated_at)
+    VALUES %s
+    ON CONFLICT (ticker, date) 
+    DO UPDATE SET 
+        amount = EXCLUDED.amount,
+        updated_at = EXCLUDED.updated_at
+"""
+SPLIT_UPSERT_SQL = """
+    INSERT INTO splits (ticker, date, ratio, updated_at)
+    VALUES %s
+    ON CONFLICT (ticker, date) 
+    DO UPDATE SET 
+        ratio = EXCLUDED.ratio,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# get_stock_data가 반환하는 DataFrame의 컬럼 타입
+# 시가/고가/저가는 float32로 메모리를 줄이고, 수익률 계산과 API 응답에 쓰는 종가/배당금은 float64 유지
+STOCK_COLUMN_DTYPES = {
+    'open': 'float32',
+    'high': 'float32',
+    'low': 'float32',
+    'close': 'float64',
+    'volume': 'int64',
+    'dividend': 'float64'
+}
+
+# get_stock_data 결과를 저장하는 Parquet 디스크 캐시 디렉터리
+STOCK_CACHE_DIR = os.getenv('STOCK_CACHE_DIR', 'cache')
+# 캐시 파일 형식 버전 (컬럼 타입이 바뀌면 올려서 예전 파일을 쓰지 않음)
+STOCK_CACHE_FORMAT = 2
+# 캐시 파일의 Parquet 메타데이터에 DB 갱신 버전을 기록하는 키
+STOCK_CACHE_VERSION_KEY = b'stock_cache_version'
+# 7일 넘게 다시 쓰이지 않은 캐시 파일은 삭제 (정리는 프로세스당 1시간에 한 번)
+STOCK_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+STOCK_CACHE_SWEEP_INTERVAL_SECONDS = 3600
+_stock_cache_sweep = {'t': 0.0}
+_stock_cache_sweep_lock = threading.Lock()
+
+# get_stock_data 결과 메모리 캐시 (최대 1024구간, 5분 후 만료, 저장 시 종목 단위로 무효화)
+STOCK_DATA_CACHE_SIZE = 1024
+STOCK_DATA_TTL_SECONDS = 300
+
+_stock_data_cache = TTLCache(maxsize=STOCK_DATA_CACHE_SIZE, ttl=STOCK_DATA_TTL_SECONDS)
+_stock_data_cache_lock = threading.Lock()
+
+# 주식 정보 캐시 (최대 100종목, 1시간 후 만료)
+STOCK_INFO_CACHE_SIZE = 100
+STOCK_INFO_TTL_SECONDS = 3600
+
+# 재시작/다른 워커와 공유하는 주식 정보 디스크 캐시 (24시간 후 만료)
+STOCK_INFO_CACHE_DIR = os.getenv('STOCK_INFO_CACHE_DIR', '.yfinance_cache')
+STOCK_INFO_DISK_TTL_SECONDS = 86400
+
+_info_cache = TTLCache(maxsize=STOCK_INFO_CACHE_SIZE, ttl=STOCK_INFO_TTL_SECONDS)
+_info_cache_lock = threading.Lock()
+_info_locks = defaultdict(threading.Lock)
+_info_disk_cache = None
+
+# 이 행 수보다 큰 구간은 COPY ... TO STDOUT CSV로 읽음 (행별 튜플 생성 생략)
+COPY_READ_THRESHOLD_ROWS = 10000
+STOCK_RANGE_SELECT = """
+    SELECT date, open, high, low, close, volume, dividend
+    FROM stocks
+    WHERE ticker = %s
+    AND date BETWEEN %s AND %s
+    ORDER BY date
+"""
+
+# 커넥션 풀 크기 (워커 스레드 수에 맞춰 환경변수로 조정)
+DB_POOL_MIN_CONN = int(os.getenv('DB_POOL_MIN_CONN', 1))
+DB_POOL_MAX_CONN = int(os.getenv('DB_POOL_MAX_CONN', 16))
+
+# 연결마다 한 번만 PREPARE 해두고 EXECUTE로 재사용하는 조회 쿼리
+PREPARED_STATEMENTS = {
+    'get_stock': """
+        PREPARE get_stock (VARCHAR, DATE, DATE) AS
+        SELECT date, open, high, low, close, volume, dividend
+        FROM stocks
+        WHERE ticker = $1 
+        AND date BETWEEN $2 AND $3
+        ORDER BY date
+    """,
+    'stock_version': """
+        PREPARE stock_version (VARCHAR, DATE, DATE) AS
+        SELECT MAX(updated_at), COUNT(*)
+        FROM stocks
+        WHERE ticker = $1 
+        AND date BETWEEN $2 AND $3
+    """,
+    # (ticker, date DESC) INCLUDE (updated_at) 인덱스만으로 읽는 조회
+    'latest_stock_row': """
+        PREPARE latest_stock_row (VARCHAR) AS
+        SELECT date, updated_at
+        FROM stocks
+        WHERE ticker = $1
+        ORDER BY date DESC
+        LIMIT 1
+    """
+}
+
+class _PooledConnection(PgConnection):
+    """PREPARE 실행 여부를 기억하는 커넥션"""
+    statements_prepared = False
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ThreadedConnectionPool:
+    """프로세스 공용 커넥션 풀을 (최초 호출 시) 생성해서 반환합니다."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    DB_POOL_MIN_CONN, DB_POOL_MAX_CONN, os.getenv('DATABASE_URL'),
+                    connection_factory=_PooledConnection
+                )
+    return _pool
+
+def _prepare_statements(conn):
+    """새 연결에 PREPARED_STATEMENTS를 등록합니다 (세션이 유지되는 동안 재사용)."""
+    with conn.cursor() as cur:
+        for statement in PREPARED_STATEMENTS.values():
+            cur.execute(statement)
+    conn.commit()
+    conn.statements_prepared = True
+
+@contextmanager
 def get_db_connection():
-    """데이터베이스 연결을 생성합니다."""
+    """커넥션 풀에서 연결을 빌려옵니다.
+    블록이 정상 종료되면 커밋, 예외가 나면 롤백한 뒤 풀에 반납합니다."""
     try:
-        return psycopg2.connect(os.getenv('DATABASE_URL'))
+        pool = _get_pool()
+        conn = pool.getconn()
     except Exception as e:
         logger.error(f"데이터베이스 연결 실패: {str(e)}")
         raise
 
+    try:
+        if not conn.statements_prepared:
+            _prepare_statements(conn)
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        # 끊어진 연결은 풀에 돌려놓지 않고 닫아서 다음 요청이 새로 연결하게 함
+        pool.putconn(conn, close=bool(conn.closed))
+
+def _get_yf_session():
+    """모든 yfinance 호출이 함께 쓰는 HTTP 세션을 (최초 호출 시) 생성해서 반환합니다.
+    연결을 keep-alive로 재사용해서 요청마다 TCP/TLS 핸드셰이크를 하지 않습니다."""
+    global _yf_session
+    if _yf_session is None:
+        with _yf_session_lock:
+            if _yf_session is None:
+                _yf_session = curl_requests.Session(impersonate='chrome')
+    return _yf_session
+
+def _throttle_api_request():
+    """토큰 버킷에서 요청 1회분을 꺼냅니다.
+    버킷이 비어있을 때만 다음 토큰이 찰 때까지 대기하므로, 평소에는 대기 없이 바로 요청합니다."""
+    refill_per_second = API_RATE_LIMIT_PER_MINUTE / 60
+    with _api_call_lock:
+        now = time.monotonic()
+        _api_bucket['tokens'] = min(
+            float(API_RATE_LIMIT_PER_MINUTE),
+            _api_bucket['tokens'] + (now - _api_bucket['t']) * refill_per_second
+        )
+        _api_bucket['t'] = now
+        if _api_bucket['tokens'] < 1:
+            time.sleep((1 - _api_bucket['tokens']) / refill_per_second)
+            _api_bucket['tokens'] = 1.0
+            _api_bucket['t'] = time.monotonic()
+        _api_bucket['tokens'] -= 1
+
+def _is_rate_limited(error: Exception) -> bool:
+    """yfinance 예외가 429(요청 한도 초과)인지 확인합니다."""
+    return isinstance(error, YFRateLimitError) or '429' in str(error) or 'Too Many Requests' in str(error)
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+@lru_cache(maxsize=1)
+def _utc_dates(day_index: int):
+    """UTC 기준 일 번호로 (오늘, 어제 YYYY-MM-DD)를 만듭니다. 날짜가 바뀔 때만 다시 계산됩니다."""
+    today = _EPOCH_DATE + timedelta(days=day_index)
+    return today, (today - timedelta(days=1)).isoformat()
+
+def _today_utc():
+    """캐시된 (오늘, 어제 YYYY-MM-DD)를 반환합니다."""
+    return _utc_dates(int(time.time() // 86400))
+
+def normalize_ticker(ticker: str) -> str:
+    """종목 코드를 저장/조회에 쓰는 형태(앞뒤 공백 제거, 대문자)로 맞춥니다."""
+    return ticker.strip().upper()
+
 def validate_date(date_str: str) -> str:
-    """날짜가 유효한지 확인하고 적절한 형식으로 반환합니다."""
+    """날짜가 유효한지 확인하고 YYYY-MM-DD 형식으로 반환합니다."""
+    today, yesterday = _today_utc()
     try:
-        date = datetime.strptime(date_str, '%Y-%m-%d')
-        today = datetime.now(pytz.UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            day = date.fromisoformat(date_str)
+        except ValueError:
+            # fromisoformat은 0을 채우지 않은 날짜(2024-1-5)를 거부하므로 기존 형식으로 다시 확인
+            day = datetime.strptime(date_str, '%Y-%m-%d').date()
         
         # 미래 날짜는 어제 날짜로 조정
-        if date.date() >= today.date():
-            yesterday = (today - timedelta(days=1)).strftime('%Y-%m-%d')
+        if day >= today:
             logger.info(f"미래 날짜 {date_str}를 {yesterday}로 조정")
             return yesterday
-        return date_str
+        return day.isoformat()
     except ValueError as e:
         logger.error(f"잘못된 날짜 형식: {date_str}, 오류: {str(e)}")
-        yesterday = (datetime.now(pytz.UTC) - timedelta(days=1)).strftime('%Y-%m-%d')
         return yesterday
 
-@lru_cache(maxsize=100)
 def get_cached_stock_info(ticker: str) -> dict:
-    """주식 정보를 캐시에서 가져오거나 API를 통해 가져옵니다."""
+    """주식 정보를 캐시에서 가져오거나 API를 통해 가져옵니다.
+    메모리 캐시(STOCK_INFO_TTL_SECONDS) → 디스크 캐시(STOCK_INFO_DISK_TTL_SECONDS) 순으로 확인하며,
+    같은 종목에 대한 동시 요청은 종목별 락으로 묶어서 API를 한 번만 호출합니다."""
+    with _info_cache_lock:
+        if ticker in _info_cache:
+            return _info_cache[ticker]
+        ticker_lock = _info_locks[ticker]
+
+    with ticker_lock:
+        # 락을 기다리는 동안 다른 요청이 이미 가져왔으면 그 결과를 사용
+        with _info_cache_lock:
+            if ticker in _info_cache:
+                return _info_cache[ticker]
+
+        # 프로세스/워커 간 공유되는 디스크 캐시 확인 후, 없을 때만 API 호출
+        disk_cache = _get_info_disk_cache()
+        info = disk_cache.get(ticker)
+        if info is None:
+            info = _fetch_stock_info(ticker)
+            disk_cache.set(ticker, info, expire=STOCK_INFO_DISK_TTL_SECONDS)
+
+        with _info_cache_lock:
+            _info_cache[ticker] = info
+        return info
+
+def _get_info_disk_cache() -> diskcache.Cache:
+    """주식 정보 디스크 캐시를 (최초 호출 시) 열어서 반환합니다."""
+    global _info_disk_cache
+    if _info_disk_cache is None:
+        with _info_cache_lock:
+            if _info_disk_cache is None:
+                _info_disk_cache = diskcache.Cache(STOCK_INFO_CACHE_DIR)
+    return _info_disk_cache
+
+def _fetch_stock_info(ticker: str) -> dict:
+    """API를 통해 주식 정보를 가져옵니다 (429 응답일 때만 재시도)."""
     max_retries = 3
     retry_delay = MIN_REQUEST_DELAY
     
     for attempt in range(max_retries):
         try:
-            # API 요청 전 랜덤 딜레이
-            time.sleep(random.uniform(MIN_REQUEST_DELAY, MAX_REQUEST_DELAY))
+            # 요청 한도 안이면 대기 없이 진행
+            _throttle_api_request()
             
-            stock = yf.Ticker(ticker)
+            stock = yf.Ticker(ticker, session=_get_yf_session())
             info = stock.info
             
             if not info:
@@ -68,205 +357,317 @@ def get_cached_stock_info(ticker: str) -> dict:
                 
             return info
         except Exception as e:
+            if not _is_rate_limited(e):
+                logger.error(f"API 요청 실패: {str(e)}")
+                raise
             if attempt < max_retries - 1:
-                logger.warning(f"API 요청 실패 (시도 {attempt + 1}/{max_retries}): {str(e)}")
+                logger.warning(f"API 요청 한도 초과 (시도 {attempt + 1}/{max_retries}): {str(e)}")
                 time.sleep(retry_delay)
                 retry_delay *= 2  # 지수 백오프
             else:
                 logger.error(f"API 요청 최대 재시도 횟수 초과: {str(e)}")
                 raise
 
+def _is_row_fresh(ticker: str, row) -> bool:
+    """latest_stock_row 결과 행으로 데이터가 1시간 이내에 업데이트되었는지 판단합니다."""
+    if not row or not row[0]:
+        logger.info(f"{ticker}: 데이터가 없어서 갱신이 필요합니다")
+        return False
+    
+    last_date, last_updated = row
+    now = datetime.now(timezone.utc)
+    
+    # updated_at이 없으면 date 기준으로 판단
+    if last_updated:
+        time_diff = now - last_updated.replace(tzinfo=timezone.utc)
+    else:
+        # date 기준으로 1시간 전인지 확인 (거래 시간 고려)
+        last_date_utc = last_date.replace(tzinfo=timezone.utc)
+        time_diff = now - last_date_utc
+    
+    hours_diff = time_diff.total_seconds() / 3600
+    is_fresh = hours_diff < DATA_FRESHNESS_HOURS
+    
+    logger.info(f"{ticker}: 마지막 업데이트로부터 {hours_diff:.1f}시간 경과, 최신성: {is_fresh}")
+    return is_fresh
+
+def _is_data_fresh(cur, ticker: str) -> bool:
+    """주어진 커서로 데이터가 1시간 이내에 업데이트되었는지 확인합니다."""
+    # 가장 최근 데이터의 업데이트 시간 확인
+    cur.execute("EXECUTE latest_stock_row (%s)", (ticker,))
+    return _is_row_fresh(ticker, cur.fetchone())
+
 def check_data_freshness(ticker: str) -> bool:
     """데이터가 1시간 이내에 업데이트되었는지 확인합니다."""
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # 가장 최근 데이터의 업데이트 시간 확인
-                cur.execute("""
-                    SELECT MAX(date) as last_date, 
-                           MAX(updated_at) as last_updated 
-                    FROM stocks 
-                    WHERE ticker = %s
-                """, (ticker,))
-                result = cur.fetchone()
-                
-                if not result or not result[0]:
-                    logger.info(f"{ticker}: 데이터가 없어서 갱신이 필요합니다")
-                    return False
-                
-                last_date, last_updated = result
-                now = datetime.now(pytz.UTC)
-                
-                # updated_at이 없으면 date 기준으로 판단
-                if last_updated:
-                    time_diff = now - last_updated.replace(tzinfo=pytz.UTC)
-                else:
-                    # date 기준으로 1시간 전인지 확인 (거래 시간 고려)
-                    last_date_utc = last_date.replace(tzinfo=pytz.UTC)
-                    time_diff = now - last_date_utc
-                
-                hours_diff = time_diff.total_seconds() / 3600
-                is_fresh = hours_diff < DATA_FRESHNESS_HOURS
-                
-                logger.info(f"{ticker}: 마지막 업데이트로부터 {hours_diff:.1f}시간 경과, 최신성: {is_fresh}")
-                return is_fresh
+                return _is_data_fresh(cur, ticker)
                 
     except Exception as e:
         logger.error(f"데이터 최신성 확인 중 오류 ({ticker}): {str(e)}")
         return False
 
+def _build_rows(ticker: str, hist: pd.DataFrame, now: datetime):
+    """history(actions=True) 결과를 stocks, dividends, splits 테이블 행으로 변환합니다.
+    배당금/분할은 같은 응답의 Dividends, Stock Splits 컬럼에서 꺼내므로 추가 요청이 없습니다."""
+    dates = hist.index.strftime('%Y-%m-%d').to_numpy()
+    zeros = np.zeros(len(hist))
+    # 여러 종목을 함께 받은 경우 다른 종목만 거래한 날은 NaN이므로 0으로 채움
+    dividend_arr = np.nan_to_num(hist['Dividends'].to_numpy(dtype='float64')) if 'Dividends' in hist.columns else zeros
+    split_arr = np.nan_to_num(hist['Stock Splits'].to_numpy(dtype='float64')) if 'Stock Splits' in hist.columns else zeros
+
+    # 주가 데이터 (행 단위 iterrows 대신 컬럼 단위로 한 번에 추출, 배당금은 같은 행에 저장)
+    stock_data = list(zip(
+        itertools.repeat(ticker),
+        dates,
+        hist['Open'].to_numpy(dtype='float64').tolist(),
+        hist['High'].to_numpy(dtype='float64').tolist(),
+        hist['Low'].to_numpy(dtype='float64').tolist(),
+        hist['Close'].to_numpy(dtype='float64').tolist(),
+        hist['Volume'].to_numpy(dtype='int64').tolist(),
+        dividend_arr.tolist(),
+        itertools.repeat(now)
+    ))
+
+    # 배당금/분할이 있는 날만 별도 테이블에 저장
+    has_dividend = dividend_arr != 0
+    dividend_data = list(zip(
+        itertools.repeat(ticker),
+        dates[has_dividend],
+        dividend_arr[has_dividend].tolist(),
+        itertools.repeat(now)
+    ))
+    has_split = split_arr != 0
+    split_data = list(zip(
+        itertools.repeat(ticker),
+        dates[has_split],
+        split_arr[has_split].tolist(),
+        itertools.repeat(now)
+    ))
+    return stock_data, dividend_data, split_data
+
+def _upsert_page_size(rows: list) -> int:
+    """UPSERT_SINGLE_PAGE_ROWS 이하면 한 번의 INSERT로, 그보다 많으면 UPSERT_PAGE_SIZE씩 나눠서 보냅니다."""
+    if len(rows) <= UPSERT_SINGLE_PAGE_ROWS:
+        return max(len(rows), 1)
+    return UPSERT_PAGE_SIZE
+
+def _bulk_upsert(cur, table: str, columns: tuple, rows: list, conflict_columns: tuple):
+    """대량의 행을 COPY로 임시 테이블에 올린 뒤 INSERT ... SELECT ... ON CONFLICT 한 번으로 반영합니다."""
+    staging = f"tmp_{table}"
+    column_list = ', '.join(columns)
+    update_list = ', '.join(f"{col} = EXCLUDED.{col}" for col in columns if col not in conflict_columns)
+
+    # 임시 테이블은 WAL을 쓰지 않고 트랜잭션이 끝나면 사라짐
+    cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    cur.execute(f"TRUNCATE {staging}")
+
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cur.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH CSV", buf)
+
+    cur.execute(f"""
+        INSERT INTO {table} ({column_list})
+        SELECT {column_list} FROM {staging}
+        ON CONFLICT ({', '.join(conflict_columns)}) 
+        DO UPDATE SET {update_list}
+    """)
+
+    # 대량 적재 직후에는 autovacuum이 돌기 전까지 통계가 오래된 상태이므로 바로 갱신
+    if len(rows) >= ANALYZE_AFTER_LOAD_ROWS:
+        cur.execute(f"ANALYZE {table}")
+
+def _upsert_rows(cur, stock_data: list, dividend_data: list, split_data: list = ()):
+    """주가/배당금/분할 행을 각각 하나의 multi-row INSERT ... ON CONFLICT로 저장합니다.
+    COPY_THRESHOLD_ROWS보다 많은 주가 행은 COPY 경로(_bulk_upsert)로 저장합니다."""
+    # 주가 데이터 저장
+    if len(stock_data) > COPY_THRESHOLD_ROWS:
+        _bulk_upsert(cur, 'stocks', STOCK_TABLE_COLUMNS, stock_data, ('ticker', 'date'))
+    elif stock_data:
+        execute_values(cur, STOCK_UPSERT_SQL, stock_data, page_size=_upsert_page_size(stock_data))
+
+    # 배당금 데이터 저장
+    if dividend_data:
+        execute_values(cur, DIVIDEND_UPSERT_SQL, dividend_data, page_size=_upsert_page_size(dividend_data))
+
+    # 분할/병합 데이터 저장
+    if split_data:
+        execute_values(cur, SPLIT_UPSERT_SQL, split_data, page_size=_upsert_page_size(split_data))
+
 def fetch_stock_data(ticker: str, start_date: str, end_date: str = None, force_refresh: bool = False):
     """주식 데이터를 가져와서 데이터베이스에 저장합니다. 
     force_refresh가 True면 전체 구간을 새로 저장합니다.
-    데이터가 1시간 이상 지났으면 자동으로 갱신합니다."""
+    데이터가 1시간 이상 지났으면 자동으로 갱신합니다.
+    yfinance 요청 중에는 DB 연결을 반납하고, 삭제부터 저장까지는 하나의 트랜잭션에서 처리합니다."""
     try:
+        # 요청 시각은 한 번만 구해서 기본 종료일과 모든 행의 updated_at에 재사용
+        now = datetime.now(timezone.utc)
+
         # 날짜 유효성 검사
         start_date = validate_date(start_date)
         if end_date:
             end_date = validate_date(end_date)
-            # 시작일이 종료일보다 이후면 교체
-            if datetime.strptime(start_date, '%Y-%m-%d') > datetime.strptime(end_date, '%Y-%m-%d'):
+            # 시작일이 종료일보다 이후면 교체 (둘 다 YYYY-MM-DD라 문자열 비교로 충분)
+            if start_date > end_date:
                 start_date, end_date = end_date, start_date
         else:
-            end_date = (datetime.now(pytz.UTC) - timedelta(days=1)).strftime('%Y-%m-%d')
+            end_date = (now - timedelta(days=1)).strftime('%Y-%m-%d')
 
         logger.info(f"{ticker} 데이터 가져오기: {start_date}부터 {end_date}까지 (force_refresh={force_refresh})")
 
-        # force_refresh가 True인 경우 기존 데이터 삭제
-        if force_refresh:
-            try:
-                with get_db_connection() as conn:
-                    with conn.cursor() as cur:
-                        # 주가 데이터 삭제
-                        cur.execute("""
-                            DELETE FROM stocks 
-                            WHERE ticker = %s 
-                            AND date BETWEEN %s AND %s
-                        """, (ticker, start_date, end_date))
-                        
-                        # 배당금 데이터 삭제
-                        cur.execute("""
-                            DELETE FROM dividends 
-                            WHERE ticker = %s 
-                            AND date BETWEEN %s AND %s
-                        """, (ticker, start_date, end_date))
-                        
-                        conn.commit()
-                        logger.info(f"{ticker}의 {start_date}~{end_date} 기존 데이터 삭제 완료")
-            except Exception as e:
-                logger.error(f"기존 데이터 삭제 중 오류: {str(e)}")
-                raise
-
-        # 데이터 최신성 체크 (force_refresh가 아닌 경우에만)
         if not force_refresh:
-            is_fresh = check_data_freshness(ticker)
-            if is_fresh:
+            # 최신성 체크와 증분 저장 시작일 계산 (짧게 빌린 연결로 조회 1회)
+            with get_db_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("EXECUTE latest_stock_row (%s)", (ticker,))
+                    result = cur.fetchone()
+
+            # 데이터 최신성 체크 (force_refresh가 아닌 경우에만)
+            if _is_row_fresh(ticker, result):
                 logger.info(f"{ticker}: 데이터가 최신 상태입니다 (1시간 이내)")
                 return True
-            else:
-                logger.info(f"{ticker}: 데이터가 오래되어 갱신이 필요합니다 (1시간 이상 경과)")
+            logger.info(f"{ticker}: 데이터가 오래되어 갱신이 필요합니다 (1시간 이상 경과)")
 
-        # 증분 저장: DB에서 마지막 저장 날짜 조회
-        if not force_refresh:
-            try:
-                with get_db_connection() as conn:
-                    with conn.cursor() as cur:
-                        # 마지막 날짜와 실제 데이터 개수 모두 확인
-                        cur.execute("SELECT MAX(date), COUNT(*) FROM stocks WHERE ticker = %s", (ticker,))
-                        result = cur.fetchone()
-                        last_date = result[0]
-                        data_count = result[1]
-                        
-                        if last_date and data_count > 0:
-                            last_date_str = last_date.strftime('%Y-%m-%d')
-                            # 만약 마지막 저장 날짜가 end_date보다 이전이면, 그 다음날부터만 추가
-                            if last_date_str >= end_date:
-                                logger.info(f"이미 {ticker}의 {start_date}~{end_date} 데이터가 모두 저장되어 있음.")
-                                return True
-                            # 시작일이 이미 저장된 마지막 날짜보다 이전이면, 그 다음날로 조정
-                            if start_date <= last_date_str:
-                                start_date = (last_date + timedelta(days=1)).strftime('%Y-%m-%d')
-                                logger.info(f"시작일을 마지막 저장 날짜 다음 날인 {start_date}로 조정")
-                        else:
-                            # DB에 데이터가 없으면 전체 구간 저장
-                            logger.info(f"{ticker}의 DB 데이터가 없어서 전체 구간 저장을 진행합니다.")
-            except Exception as e:
-                logger.error(f"마지막 저장 날짜 조회 중 오류: {str(e)}")
-                raise
+            # 증분 저장: 마지막 저장 날짜 (행이 없으면 None)
+            # yfinance 요청 구간을 줄이는 용도이며, 겹치는 날짜는 ON CONFLICT가 처리
+            last_date = result[0] if result else None
+            
+            if last_date:
+                last_date_str = last_date.strftime('%Y-%m-%d')
+                # 만약 마지막 저장 날짜가 end_date보다 이전이면, 그 다음날부터만 추가
+                if last_date_str >= end_date:
+                    logger.info(f"이미 {ticker}의 {start_date}~{end_date} 데이터가 모두 저장되어 있음.")
+                    return True
+                # 시작일이 이미 저장된 마지막 날짜보다 이전이면, 그 다음날로 조정
+                if start_date <= last_date_str:
+                    start_date = (last_date + timedelta(days=1)).strftime('%Y-%m-%d')
+                    logger.info(f"시작일을 마지막 저장 날짜 다음 날인 {start_date}로 조정")
+            else:
+                # DB에 데이터가 없으면 전체 구간 저장
+                logger.info(f"{ticker}의 DB 데이터가 없어서 전체 구간 저장을 진행합니다.")
 
-        # API 요청 전 랜덤 딜레이
-        time.sleep(random.uniform(MIN_REQUEST_DELAY, MAX_REQUEST_DELAY))
+        # yfinance 요청 동안에는 DB 연결을 잡고 있지 않음 (다른 요청이 풀을 사용)
+        # 요청 한도 안이면 대기 없이 진행
+        _throttle_api_request()
 
         # yfinance에서 데이터 가져오기
-        stock = yf.Ticker(ticker)
-        hist = stock.history(start=start_date, end=end_date)
+        stock = yf.Ticker(ticker, session=_get_yf_session())
+        # 배당금/분할까지 한 번의 요청으로 가져오기
+        hist = stock.history(start=start_date, end=end_date, actions=True)
         
         if hist.empty:
             logger.warning(f"{ticker}의 {start_date}~{end_date} 데이터가 없습니다")
             return False
 
-        # 주가 데이터 저장
-        stock_data = []
-        for date, row in hist.iterrows():
-            stock_data.append((
-                ticker,
-                date.strftime('%Y-%m-%d'),
-                float(row['Open']),
-                float(row['High']),
-                float(row['Low']),
-                float(row['Close']),
-                int(row['Volume']),
-                datetime.now(pytz.UTC)
-            ))
-
-        # 배당금 데이터 가져오기
-        dividends = stock.dividends
-        if not dividends.empty:
-            dividend_data = []
-            for date, amount in dividends.items():
-                if start_date <= date.strftime('%Y-%m-%d') <= end_date:
-                    dividend_data.append((
-                        ticker,
-                        date.strftime('%Y-%m-%d'),
-                        float(amount),
-                        datetime.now(pytz.UTC)
-                    ))
+        rows = _build_rows(ticker, hist, now)
 
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # 주가 데이터 저장
-                execute_batch(cur, """
-                    INSERT INTO stocks (ticker, date, open, high, low, close, volume, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (ticker, date) 
-                    DO UPDATE SET 
-                        open = EXCLUDED.open,
-                        high = EXCLUDED.high,
-                        low = EXCLUDED.low,
-                        close = EXCLUDED.close,
-                        volume = EXCLUDED.volume,
-                        updated_at = EXCLUDED.updated_at
-                """, stock_data)
-
-                # 배당금 데이터 저장
-                if not dividends.empty and dividend_data:
-                    execute_batch(cur, """
-                        INSERT INTO dividends (ticker, date, amount, updated_at)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (ticker, date) 
-                        DO UPDATE SET 
-                            amount = EXCLUDED.amount,
-                            updated_at = EXCLUDED.updated_at
-                    """, dividend_data)
-
-            conn.commit()
-            logger.info(f"{ticker}의 {start_date}~{end_date} 데이터 저장 완료")
-            return True
+                # force_refresh가 True인 경우 기존 데이터 삭제 (저장과 같은 트랜잭션)
+                if force_refresh:
+                    # 주가 데이터 삭제
+                    cur.execute("""
+                        DELETE FROM stocks 
+                        WHERE ticker = %s 
+                        AND date BETWEEN %s AND %s
+                    """, (ticker, start_date, end_date))
+                    
+                    # 배당금 데이터 삭제
+                    cur.execute("""
+                        DELETE FROM dividends 
+                        WHERE ticker = %s 
+                        AND date BETWEEN %s AND %s
+                    """, (ticker, start_date, end_date))
+                    
+                    # 분할/병합 데이터 삭제
+                    cur.execute("""
+                        DELETE FROM splits 
+                        WHERE ticker = %s 
+                        AND date BETWEEN %s AND %s
+                    """, (ticker, start_date, end_date))
+                    
+                    logger.info(f"{ticker}의 {start_date}~{end_date} 기존 데이터 삭제")
+
+                _upsert_rows(cur, *rows)
+
+        invalidate_stock_cache(ticker)
+        logger.info(f"{ticker}의 {start_date}~{end_date} 데이터 저장 완료")
+        return True
 
     except Exception as e:
         logger.error(f"{ticker} 데이터 가져오기 실패: {str(e)}")
         raise
 
+def fetch_stock_data_bulk(tickers: list, start_date: str, end_date: str = None,
+                          max_workers: int = BULK_FETCH_MAX_WORKERS) -> dict:
+    """여러 종목의 주가/배당금을 yf.download 한 번으로 가져와서 한 번에 저장합니다.
+    yfinance 내부 스레드는 max_workers개로 제한하고, 한 종목의 변환 실패가
+    다른 종목 저장을 막지 않도록 종목별로 처리합니다.
+    종목별 성공 여부를 담은 dict를 반환합니다."""
+    # 같은 종목이 두 번 들어오면 한 INSERT ... ON CONFLICT에 같은 행이 겹치므로 정규화 후 중복 제거
+    tickers = list(dict.fromkeys(normalize_ticker(t) for t in tickers))
+    now = datetime.now(timezone.utc)
+    start_date = validate_date(start_date)
+    if end_date:
+        end_date = validate_date(end_date)
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+    else:
+        end_date = (now - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    logger.info(f"{', '.join(tickers)} 일괄 데이터 가져오기: {start_date}부터 {end_date}까지")
+
+    # 요청 한도 안이면 대기 없이 진행
+    _throttle_api_request()
+
+    # 배당금(actions)까지 포함해서 전 종목을 한 번에 요청
+    hist_all = yf.download(
+        tickers=tickers, start=start_date, end=end_date,
+        group_by='ticker', actions=True, threads=max(min(max_workers, len(tickers)), 1), progress=False,
+        session=_get_yf_session()
+    )
+
+    stock_data, dividend_data, split_data, status = [], [], [], {}
+    for ticker in tickers:
+        if isinstance(hist_all.columns, pd.MultiIndex):
+            if ticker not in hist_all.columns.get_level_values(0):
+                logger.warning(f"{ticker}의 {start_date}~{end_date} 데이터가 없습니다")
+                status[ticker] = False
+                continue
+            hist = hist_all[ticker]
+        else:
+            hist = hist_all
+        hist = hist.dropna(subset=['Open', 'High', 'Low', 'Close'])
+
+        if hist.empty:
+            logger.warning(f"{ticker}의 {start_date}~{end_date} 데이터가 없습니다")
+            status[ticker] = False
+            continue
+
+        try:
+            rows = _build_rows(ticker, hist, now)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"{ticker} 데이터 변환 실패: {str(e)}")
+            status[ticker] = False
+            continue
+        stock_data.extend(rows[0])
+        dividend_data.extend(rows[1])
+        split_data.extend(rows[2])
+        status[ticker] = True
+
+    if stock_data:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                _upsert_rows(cur, stock_data, dividend_data, split_data)
+        for ticker, stored in status.items():
+            if stored:
+                invalidate_stock_cache(ticker)
+        logger.info(f"{len(stock_data)}건의 주가, {len(dividend_data)}건의 배당금 일괄 저장 완료")
+
+    return status
+
 def check_dividend_data(ticker: str, start_date: str, end_date: str):
     """데이터베이스에 저장된 배당금 데이터를 확인합니다."""
     try:
@@ -296,39 +697,147 @@ def check_dividend_data(ticker: str, start_date: str, end_date: str):
         logger.error(f"배당금 데이터 확인 중 오류: {str(e)}")
         return None
 
+def _cache_key(ticker: str, start_date: str, end_date: str) -> str:
+    """종목/구간으로 디스크 캐시 키를 만듭니다 (같은 구간은 항상 같은 파일을 덮어씀)."""
+    return hashlib.sha1(f"{ticker}|{start_date}|{end_date}".encode()).hexdigest()
+
+def _cache_version(version) -> bytes:
+    """DB 갱신 버전(마지막 갱신 시각, 행 수)과 캐시 형식 버전을 캐시 파일에 기록할 값으로 만듭니다."""
+    return f"{version[0]}|{version[1]}|{STOCK_CACHE_FORMAT}".encode()
+
+def _read_cached_frame(cache_path: str, cache_version: bytes):
+    """캐시 파일에 기록된 버전이 같을 때만 DataFrame을 읽고, 아니면 None을 반환합니다."""
+    metadata = pq.read_schema(cache_path).metadata or {}
+    if metadata.get(STOCK_CACHE_VERSION_KEY) != cache_version:
+        return None
+    return pd.read_parquet(cache_path)
+
+def _write_cached_frame(cache_path: str, df: pd.DataFrame, cache_version: bytes):
+    """버전을 Parquet 메타데이터에 기록해서 캐시 파일을 교체합니다."""
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        STOCK_CACHE_VERSION_KEY: cache_version
+    })
+    # 동시에 읽는 요청이 깨진 파일을 보지 않도록 임시 파일에 쓰고 교체
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _sweep_stock_cache():
+    """STOCK_CACHE_MAX_AGE_SECONDS 동안 다시 쓰이지 않은 캐시 파일을 삭제합니다 (1시간에 한 번만 실행)."""
+    now = time.time()
+    with _stock_cache_sweep_lock:
+        if now - _stock_cache_sweep['t'] < STOCK_CACHE_SWEEP_INTERVAL_SECONDS:
+            return
+        _stock_cache_sweep['t'] = now
+    try:
+        with os.scandir(STOCK_CACHE_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(('.parquet', '.tmp')):
+                    continue
+                try:
+                    if now - entry.stat().st_mtime > STOCK_CACHE_MAX_AGE_SECONDS:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+    except OSError as e:
+        logger.warning(f"캐시 정리 실패 ({STOCK_CACHE_DIR}): {str(e)}")
+
+def _copy_stock_rows(cur, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """구간 데이터를 COPY CSV로 받아 read_csv로 바로 열 단위 DataFrame을 만듭니다."""
+    query = cur.mogrify(STOCK_RANGE_SELECT, (ticker, start_date, end_date)).decode()
+    buf = io.StringIO()
+    cur.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV HEADER", buf)
+    buf.seek(0)
+    return pd.read_csv(buf, index_col='date', parse_dates=['date'], dtype=STOCK_COLUMN_DTYPES)
+
+def invalidate_stock_cache(ticker: str):
+    """해당 종목의 get_stock_data 메모리 캐시를 비웁니다."""
+    with _stock_data_cache_lock:
+        for key in [key for key in _stock_data_cache if key[0] == ticker]:
+            _stock_data_cache.pop(key, None)
+
 def get_stock_data(ticker: str, start_date: str, end_date: str = None):
-    """데이터베이스에서 주식 데이터를 가져옵니다."""
+    """데이터베이스에서 주식 데이터를 가져옵니다.
+    최근(STOCK_DATA_TTL_SECONDS 이내)에 읽은 구간은 메모리 캐시에서 복사본을 반환하고,
+    같은 구간의 DB 데이터가 바뀌지 않았으면 Parquet 디스크 캐시에서 바로 읽습니다."""
+    end_date = end_date or start_date
+    key = (ticker, start_date, end_date)
+    with _stock_data_cache_lock:
+        cached = _stock_data_cache.get(key)
+    if cached is not None:
+        return cached.copy()
+
+    df = _load_stock_data(ticker, start_date, end_date)
+    if not df.empty:
+        # 호출한 쪽에서 수정해도 캐시가 바뀌지 않도록 복사본을 저장
+        with _stock_data_cache_lock:
+            _stock_data_cache[key] = df.copy()
+    return df
+
+def _load_stock_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """DB 또는 Parquet 디스크 캐시에서 구간 데이터를 읽습니다."""
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cur:
-                # 주가 데이터 가져오기
-                cur.execute("""
-                    SELECT s.date, s.open, s.high, s.low, s.close, s.volume, 
-                           COALESCE(d.amount, 0) as dividend
-                    FROM stocks s
-                    LEFT JOIN dividends d ON s.ticker = d.ticker AND s.date = d.date
-                    WHERE s.ticker = %s 
-                    AND s.date BETWEEN %s AND %s
-                    ORDER BY s.date
-                """, (ticker, start_date, end_date or start_date))
-                
-                # 결과를 DataFrame으로 변환
-                columns = ['date', 'open', 'high', 'low', 'close', 'volume', 'dividend']
-                data = cur.fetchall()
-                
-                if not data:
-                    logger.warning(f"No data found for {ticker}")
-                    return pd.DataFrame(columns=columns)
-                
-                df = pd.DataFrame(data, columns=columns)
-                df['date'] = pd.to_datetime(df['date'])
-                df.set_index('date', inplace=True)
-                return df
+                # 구간 데이터의 마지막 갱신 시각과 행 수 (바뀌면 캐시 무효화)
+                cur.execute("EXECUTE stock_version (%s, %s, %s)", (ticker, start_date, end_date))
+                version = cur.fetchone()
+
+            cache_path = None
+            if version and version[1]:
+                cache_path = os.path.join(STOCK_CACHE_DIR, _cache_key(ticker, start_date, end_date) + '.parquet')
+                cache_version = _cache_version(version)
+                if os.path.exists(cache_path):
+                    try:
+                        cached = _read_cached_frame(cache_path, cache_version)
+                        if cached is not None:
+                            return cached
+                    except Exception as e:
+                        logger.warning(f"캐시 읽기 실패 ({cache_path}): {str(e)}")
+
+            # 주가 데이터를 타입이 지정된 DataFrame으로 바로 읽기
+            if version and version[1] > COPY_READ_THRESHOLD_ROWS:
+                with conn.cursor() as cur:
+                    df = _copy_stock_rows(cur, ticker, start_date, end_date)
+            else:
+                df = pd.read_sql_query("EXECUTE get_stock (%s, %s, %s)", conn,
+                    params=(ticker, start_date, end_date),
+                    index_col='date',
+                    parse_dates=['date'],
+                    dtype=STOCK_COLUMN_DTYPES
+                )
+            
+            if df.empty:
+                logger.warning(f"No data found for {ticker}")
+            elif cache_path:
+                try:
+                    os.makedirs(STOCK_CACHE_DIR, exist_ok=True)
+                    _write_cached_frame(cache_path, df, cache_version)
+                except Exception as e:
+                    logger.warning(f"캐시 저장 실패 ({cache_path}): {str(e)}")
+                _sweep_stock_cache()
+            return df
                 
     except Exception as e:
         logger.error(f"Error getting data for {ticker}: {str(e)}")
         return pd.DataFrame()
 
+@njit(cache=True)
+def _returns_kernel(close_arr, div_arr, investment):
+    """종가/배당금 배열로 초기가, 최종가, 보유 주식수, 자본 이득, 총 배당금을 계산합니다."""
+    initial = close_arr[0]
+    final = close_arr[-1]
+    shares = investment / initial
+    capital_gains = (final - initial) * shares
+    total_dividends = div_arr.sum() * shares
+    return initial, final, shares, capital_gains, total_dividends
+
 def calculate_returns(ticker: str, investment_amount: float, start_date: str, end_date: str = None):
     """투자 수익률을 계산합니다."""
     try:
@@ -338,59 +847,37 @@ def calculate_returns(ticker: str, investment_amount: float, start_date: str, en
             logger.error(f"{ticker}의 데이터가 없습니다")
             return None
 
-        # 날짜 정렬
-        stock_data = stock_data.sort_index()
+        # get_stock_data는 이미 날짜순(ORDER BY date)이므로 정렬하지 않고 양 끝만 사용
+        dates = stock_data.index
+        first_date, last_date = dates[0], dates[-1]
 
-        # 초기값과 최종값
-        initial_price = stock_data.iloc[0]['close']
-        final_price = stock_data.iloc[-1]['close']
-        
-        # 보유 주식수
-        shares = investment_amount / initial_price
-        
-        # 자본 이득
-        capital_gains = (final_price - initial_price) * shares
-        
-        # 배당금 계산
-        total_dividends = stock_data['dividend'].sum() * shares
+        # 투자금은 한 번만 float로 변환해서 이후 계산에 재사용
+        investment = float(investment_amount)
+
+        # 초기값/최종값, 보유 주식수, 자본 이득, 배당금 계산
+        initial_price, final_price, shares, capital_gains, total_dividends = _returns_kernel(
+            stock_data['close'].to_numpy(dtype='float64'),
+            stock_data['dividend'].to_numpy(dtype='float64'),
+            investment
+        )
         
         # 총 수익과 수익률
         total_return = capital_gains + total_dividends
-        total_return_percentage = (total_return / investment_amount) * 100
-        
-        # 보유 기간 계산 (실제 개월 수)
-        first_date = stock_data.index[0]
-        last_date = stock_data.index[-1]
-        
-        logger.info(f"\n=== {ticker} 보유 기간 계산 ===")
-        logger.info(f"시작일: {first_date.strftime('%Y-%m-%d')}")
-        logger.info(f"종료일: {last_date.strftime('%Y-%m-%d')}")
-        
-        # 연, 월 차이 계산
-        years_diff = last_date.year - first_date.year
-        months_diff = last_date.month - first_date.month
-        
-        logger.info(f"연도 차이: {years_diff}")
-        logger.info(f"월 차이: {months_diff}")
-        
-        # 총 개월 수 계산
-        months_held = years_diff * 12 + months_diff
-        logger.info(f"기본 개월 수: {months_held}")
+        total_return_percentage = (total_return / investment) * 100
         
+        # 보유 기간 계산 (실제 개월 수, 현재 달 포함, 최소 1개월)
+        months_held = (last_date.year - first_date.year) * 12 + last_date.month - first_date.month
         if last_date.day < first_date.day:
             months_held -= 1
-            logger.info(f"일자 조정 후 개월 수: {months_held}")
-        
-        months_held = max(months_held + 1, 1)  # 최소 1개월, 현재 달 포함
-        logger.info(f"최종 개월 수: {months_held}")
-        logger.info("========================\n")
+        months_held = max(months_held + 1, 1)
+        logger.debug("%s 보유 기간: %s ~ %s, %d개월", ticker, first_date, last_date, months_held)
         
         # 월 평균 배당금 계산
         monthly_dividend = total_dividends / months_held
         
         # 연간 배당률 계산 (12개월 기준)
         annual_dividends = monthly_dividend * 12
-        dividend_yield = (annual_dividends / investment_amount) * 100
+        dividend_yield = (annual_dividends / investment) * 100
 
         return {
             'ticker': ticker,
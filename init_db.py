@@ -5,44 +5,70 @@ Render 배포 시 자동으로 테이블을 생성합니다.
 """
 
 import os
+import hashlib
 import psycopg2
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 스키마 초기화를 한 프로세스만 실행하도록 잡는 advisory lock 키
+SCHEMA_LOCK_ID = 726677
+
 def init_database():
-    """데이터베이스에 필요한 테이블들을 생성합니다."""
-    
+    """데이터베이스에 필요한 테이블들을 생성합니다.
+    schema.sql 내용이 마지막으로 적용한 것과 같으면 DDL을 다시 실행하지 않습니다."""
+
     # DATABASE_URL에서 연결 정보 가져오기
     database_url = os.getenv('DATABASE_URL')
-    
+
     if not database_url:
         print("DATABASE_URL 환경변수가 설정되지 않았습니다.")
         return False
-    
+
+    conn = None
     try:
+        # schema.sql 파일 읽기 (적용 여부 비교용 체크섬 포함)
+        with open('schema.sql', 'r') as f:
+            schema_sql = f.read()
+        checksum = hashlib.sha256(schema_sql.encode()).hexdigest()
+
         # 데이터베이스 연결
         conn = psycopg2.connect(database_url)
         cur = conn.cursor()
-        
-        # schema.sql 파일 읽기
-        with open('schema.sql', 'r') as f:
-            schema_sql = f.read()
-        
-        # 테이블 생성 실행
+
+        # 다른 프로세스가 이미 초기화 중이면 건너뜀 (연결이 닫히면 락도 해제됨)
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (SCHEMA_LOCK_ID,))
+        if not cur.fetchone()[0]:
+            print("다른 프로세스가 데이터베이스를 초기화하고 있어서 건너뜁니다.")
+            return True
+
+        # 같은 스키마가 이미 적용되어 있으면 건너뜀
+        cur.execute("SELECT to_regclass('public.schema_version')")
+        if cur.fetchone()[0]:
+            cur.execute("SELECT checksum FROM schema_version")
+            row = cur.fetchone()
+            if row and row[0] == checksum:
+                print("✅ 데이터베이스 스키마가 최신 상태입니다.")
+                return True
+
+        # 테이블 생성과 적용 버전 기록을 하나의 트랜잭션으로 실행
         cur.execute(schema_sql)
+        cur.execute("CREATE TABLE IF NOT EXISTS schema_version (checksum TEXT NOT NULL)")
+        cur.execute("DELETE FROM schema_version")
+        cur.execute("INSERT INTO schema_version (checksum) VALUES (%s)", (checksum,))
         conn.commit()
-        
+
         print("✅ 데이터베이스 테이블 생성 완료!")
-        
-        cur.close()
-        conn.close()
-        
+
         return True
-        
+
     except Exception as e:
         print(f"❌ 데이터베이스 초기화 실패: {str(e)}")
         return False
 
+    finally:
+        if conn is not None:
+            conn.close()
+
 if __name__ == '__main__':
-    init_database() 
\ No newline at end of file
+    init_database()
@@ -11,6 +11,13 @@ CREATE TABLE IF NOT EXISTS stocks (
     PRIMARY KEY (ticker, date)
 );
 
+-- 배당금을 주가 행에 함께 저장 (조회 시 dividends 테이블 JOIN 제거)
+ALTER TABLE stocks ADD COLUMN IF NOT EXISTS dividend FLOAT NOT NULL DEFAULT 0;
+
+-- 종목별 최신 데이터 조회용 커버링 인덱스 (최신성 체크가 인덱스만으로 처리됨)
+CREATE INDEX IF NOT EXISTS idx_stocks_ticker_date_desc
+    ON stocks (ticker, date DESC) INCLUDE (updated_at);
+
 -- 배당금 테이블
 CREATE TABLE IF NOT EXISTS dividends (
     ticker VARCHAR(10),
@@ -20,6 +27,14 @@ CREATE TABLE IF NOT EXISTS dividends (
     PRIMARY KEY (ticker, date)
 );
 
+-- 기존 배당금 데이터를 stocks.dividend로 이관 (이미 반영된 행은 건너뜀)
+UPDATE stocks s
+SET dividend = d.amount
+FROM dividends d
+WHERE s.ticker = d.ticker
+  AND s.date = d.date
+  AND s.dividend <> d.amount;
+
 -- 주식 분할/병합 테이블
 CREATE TABLE IF NOT EXISTS splits (
     ticker VARCHAR(10),
@@ -43,4 +58,4 @@ CREATE TABLE IF NOT EXISTS purchases (
     user_id INTEGER REFERENCES users(id),
     amount FLOAT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-); 
\ No newline at end of file
+);
@@ -2,12 +2,18 @@
 
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
-import pytz
-from typing import Dict, Any, Optional
+import numpy as np
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from zoneinfo import ZoneInfo
 import logging
 import argparse
-from decimal import Decimal, ROUND_HALF_UP
+import os
+import time
+import json
+import threading
 
 # 로깅 설정
 logging.basicConfig(
@@ -16,6 +22,118 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 주가/배당 날짜의 기준 시간대 (뉴욕, 표준 라이브러리 zoneinfo)
+EASTERN_TZ = ZoneInfo('America/New_York')
+
+# yfinance 결과 디스크 캐시 (종목별 Parquet 파일에 구간을 병합해서 저장)
+# yfinance가 requests_cache 같은 캐싱 세션을 받지 않아서 응답 대신 결과 DataFrame을 Parquet로 저장
+CACHE_DIR = os.getenv('STOCK_ANALYZER_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'stock_analyzer'))
+# 같은 프로세스의 여러 스레드(Streamlit 재실행 등)가 캐시를 동시에 병합/저장하지 않도록 잠금
+_cache_lock = threading.Lock()
+# 가져온 날 기준 전날 이후가 포함된 구간은 아직 바뀔 수 있어서 1시간 후 만료
+CACHE_TTL_SECONDS = 3600
+# 시뮬레이션/검증에 필요한 컬럼 (캐시에서도 이 컬럼만 읽음)
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+REQUIRED_PRICE_COLUMNS = frozenset(PRICE_COLUMNS)
+# 시뮬레이션이 읽지 않는 시가/고가/저가만 float32로 보관 (메모리/캐시 파일 크기 절감)
+# 종가는 시뮬레이션 결과가 달라지지 않도록 float64 그대로 유지
+PRICE_DTYPES = {'Open': 'float32', 'High': 'float32', 'Low': 'float32', 'Close': 'float64'}
+
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:
+    # curl_cffi를 쓰지 않는 yfinance 버전에서는 yfinance 기본 세션을 사용
+    curl_requests = None
+
+# yfinance 공용 HTTP 세션 (requests_cache 같은 캐싱 세션은 yfinance가 받지 않아서 연결 재사용만 함)
+_yf_session = None
+_yf_session_lock = threading.Lock()
+
+def _get_yf_session():
+    """모든 yfinance 호출이 함께 쓰는 HTTP 세션을 (최초 호출 시) 생성해서 반환합니다.
+    연결을 keep-alive로 재사용해서 요청마다 TCP/TLS 핸드셰이크를 하지 않습니다."""
+    global _yf_session
+    if _yf_session is None and curl_requests is not None:
+        with _yf_session_lock:
+            if _yf_session is None:
+                _yf_session = curl_requests.Session(impersonate='chrome')
+    return _yf_session
+
+try:
+    from numba import njit
+except ImportError:
+    # numba가 없는 환경에서는 같은 함수를 파이썬/NumPy로 그대로 실행합니다
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def _reinvest_kernel(prices, dividends_per_share, initial_shares, fee_rate, min_fee, tax_rate,
+                     reinvest, min_reinvest):
+    """매월 배당금 세금/재투자 점화식 계산
+    
+    Returns:
+        (최종 주식 수, 배당세 합계, 세후 배당금 합계, 월별 세후 배당금, 월별 추가 주식 수, 월별 재투자 금액, 월별 수수료)
+    """
+    n = len(prices)
+    monthly_net_dividends = np.zeros(n)
+    added_shares = np.zeros(n)
+    invested = np.zeros(n)
+    fees = np.zeros(n)
+    shares = initial_shares
+    total_taxes = 0.0
+    total_net_dividends = 0.0
+    for i in range(n):
+        if dividends_per_share[i] <= 0:
+            continue
+        month_dividends = dividends_per_share[i] * shares
+        dividend_tax = month_dividends * tax_rate
+        net_dividends = month_dividends - dividend_tax
+        total_taxes += dividend_tax
+        total_net_dividends += net_dividends
+        monthly_net_dividends[i] = net_dividends
+        
+        if reinvest and net_dividends > min_reinvest:
+            fee = max(min_fee, net_dividends * fee_rate)
+            if net_dividends > fee:
+                invested[i] = net_dividends - fee
+                added_shares[i] = invested[i] / prices[i]
+                fees[i] = fee
+                shares += added_shares[i]
+    return shares, total_taxes, total_net_dividends, monthly_net_dividends, added_shares, invested, fees
+
+def month_starts(start_date: pd.Timestamp, end_date: pd.Timestamp) -> pd.DatetimeIndex:
+    """시작일 다음 달부터 종료일까지의 매월 1일 (시작일의 시간대 유지)"""
+    return pd.date_range(start_date.normalize() + pd.offsets.MonthBegin(1), end_date, freq='MS')
+
+def _replace_file(path: str, write) -> None:
+    """write(임시 경로)로 파일을 만든 뒤 path로 원자적으로 교체"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """JSON 파일 저장"""
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+def _as_date(value: date) -> date:
+    """datetime이면 날짜 부분만, date면 그대로 반환"""
+    return value.date() if isinstance(value, datetime) else value
+
+def _to_eastern(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """날짜(벽시계 시각)는 그대로 두고 뉴욕 시간대로 맞춤 (이미 뉴욕 시간대면 변환하지 않음)"""
+    if index.tz is None:
+        return index.tz_localize(EASTERN_TZ)
+    if str(index.tz) == EASTERN_TZ.key:
+        return index
+    return index.tz_localize(None).tz_localize(EASTERN_TZ)
+
 class StockDataValidator:
     """주식 데이터 검증을 위한 클래스"""
     
@@ -30,12 +148,13 @@ class StockDataValidator:
             logger.error("가격 데이터가 비어있습니다.")
             return False
             
-        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-        if not all(col in df.columns for col in required_columns):
-            logger.error(f"필수 컬럼이 누락되었습니다. 필요한 컬럼: {required_columns}")
+        missing_columns = REQUIRED_PRICE_COLUMNS.difference(df.columns)
+        if missing_columns:
+            logger.error(f"필수 컬럼이 누락되었습니다. 누락된 컬럼: {sorted(missing_columns)}")
             return False
             
-        if df.isnull().any().any():
+        # 필요한 컬럼만 float 배열로 꺼내서 한 번에 결측치 검사
+        if np.isnan(df[PRICE_COLUMNS].to_numpy(dtype='float64')).any():
             logger.warning("데이터에 결측치가 있습니다.")
             return False
             
@@ -52,11 +171,12 @@ class StockDataValidator:
             logger.warning("배당 데이터가 없습니다.")
             return True  # 배당이 없는 것은 유효할 수 있음
             
-        if dividends.isnull().any():
+        values = dividends.to_numpy(dtype='float64')
+        if np.isnan(values).any():
             logger.error("배당 데이터에 결측치가 있습니다.")
             return False
             
-        if (dividends < 0).any():
+        if (values < 0).any():
             logger.error("음수 배당이 존재합니다.")
             return False
             
@@ -65,124 +185,110 @@ class StockDataValidator:
 class InvestmentSimulator:
     """투자 시뮬레이션을 위한 클래스"""
     
+    # 거래 비용 설정 (모든 인스턴스가 공유하는 상수)
+    TRANSACTION_FEE_RATE = 0.0025  # 0.25% 거래 수수료
+    DIVIDEND_TAX_RATE = 0.154      # 15.4% 배당세
+    MIN_TRANSACTION_FEE = 0.50     # 최소 거래 수수료 ($0.50)
+    MAX_DAILY_VOLUME_RATIO = 0.10  # 일일 거래량의 최대 10%까지만 거래 가능
+    MIN_REINVEST_DIVIDEND = 5.0    # 세후 배당금이 $5 초과일 때만 재투자
+    
     def __init__(self, price_data: pd.DataFrame, dividends: pd.Series):
         self.price_data = price_data
         self.dividends = dividends
+        # 날짜 검색용 정렬된 인덱스와 종가 배열 (이진 탐색으로 조회)
+        self._price_index = price_data.index
+        self._close_values = price_data['Close'].to_numpy()
+        self._volume_values = price_data['Volume'].to_numpy() if 'Volume' in price_data.columns else None
+        # 월별 배당금 합계를 한 번만 계산 (정렬된 연*12+(월-1) 정수 키 -> 주당 배당금)
+        # NumPy bincount로 합산하고, 조회는 키 배열에서 이진 탐색으로 한 번에 처리
+        self._dividend_month_keys = np.empty(0, dtype='int64')
+        self._dividend_month_totals = np.empty(0)
+        if not dividends.empty:
+            month_keys = dividends.index.year.to_numpy() * 12 + dividends.index.month.to_numpy() - 1
+            keys, inverse = np.unique(month_keys, return_inverse=True)
+            self._dividend_month_keys = keys
+            self._dividend_month_totals = np.bincount(inverse, weights=dividends.to_numpy(dtype='float64'))
         self.reset_simulation()
         
-        # 거래 비용 설정
-        self.TRANSACTION_FEE_RATE = 0.0025  # 0.25% 거래 수수료
-        self.DIVIDEND_TAX_RATE = 0.154      # 15.4% 배당세
-        self.MIN_TRANSACTION_FEE = 0.50     # 최소 거래 수수료 ($0.50)
-        self.MAX_DAILY_VOLUME_RATIO = 0.10  # 일일 거래량의 최대 10%까지만 거래 가능
-        
     def reset_simulation(self):
         """시뮬레이션 변수 초기화"""
-        self.total_shares = Decimal('0')
-        self.total_invested = Decimal('0')
-        self.total_dividends_received = Decimal('0')
-        self.total_fees_paid = Decimal('0')
-        self.total_taxes_paid = Decimal('0')
+        self.total_shares = 0.0
+        self.total_invested = 0.0
+        self.total_dividends_received = 0.0
+        self.total_fees_paid = 0.0
+        self.total_taxes_paid = 0.0
         self.transactions = []
         
     def _localize_date(self, date: datetime) -> pd.Timestamp:
-        """날짜를 price_data의 시간대로 변환"""
-        if isinstance(date, str):
-            date = pd.Timestamp(date)
-        elif isinstance(date, datetime):
-            date = pd.Timestamp(date)
-        
-        # 이미 시간대가 있는 경우 변환
-        if date.tzinfo is not None:
-            if self.price_data.index.tz is not None:
-                return date.tz_convert(self.price_data.index.tz)
-            return date.tz_localize(None)
-        
-        # 시간대가 없는 경우 설정
-        if self.price_data.index.tz is not None:
-            return date.tz_localize(self.price_data.index.tz)
-        return date
+        """날짜(문자열/date/datetime)를 price_data의 시간대로 변환"""
+        date = pd.Timestamp(date)
+        tz = self.price_data.index.tz
+        if date.tzinfo is None:
+            return date.tz_localize(tz) if tz is not None else date
+        # 시간대가 있으면 변환 (price_data에 시간대가 없으면 시각은 그대로 두고 시간대만 제거)
+        return date.tz_convert(tz) if tz is not None else date.tz_localize(None)
         
     def _get_price_on_date(self, date: datetime) -> float:
         """특정 날짜의 종가 반환"""
         date = self._localize_date(date)
-        available_dates = self.price_data.index[self.price_data.index >= date]
-        if available_dates.empty:
+        i = self._price_index.searchsorted(date, side='left')
+        if i == len(self._price_index):
             raise ValueError(f"No trading data available after {date}")
-        trading_date = available_dates[0]
-        return float(self.price_data.loc[trading_date, 'Close'])
-        
-    def _get_next_month_first_trading_day(self, date: datetime) -> Optional[datetime]:
-        """다음 달의 첫 거래일 반환. 없으면 None 반환"""
-        date = self._localize_date(date)
-        next_month = date + pd.DateOffset(months=1)
-        next_month = next_month.replace(day=1)
-        available_dates = self.price_data.index[self.price_data.index >= next_month]
-        if available_dates.empty:
-            return None
-        return available_dates[0]
-        
-    def _calculate_monthly_dividends(self, date: datetime) -> Decimal:
-        """해당 월의 배당금 계산"""
-        date = self._localize_date(date)
-        month_start = date.replace(day=1)
-        month_end = (month_start + pd.DateOffset(months=1)) - pd.Timedelta(days=1)
-        
-        month_dividends = self.dividends[
-            (self.dividends.index >= month_start) &
-            (self.dividends.index <= month_end)
-        ]
-        
-        total_dividends = Decimal('0')
-        for div_date, div_amount in month_dividends.items():
-            total_dividends += Decimal(str(div_amount)) * self.total_shares
-            
-        return total_dividends
-        
-    def _calculate_transaction_fee(self, amount: Decimal) -> Decimal:
+        return float(self._close_values[i])
+        
+    def _monthly_schedule(self, start_date: pd.Timestamp, end_date: pd.Timestamp) -> list:
+        """시작일과 그 이후 매월 첫 거래일(종료일까지) 목록을 한 번에 계산"""
+        if start_date > end_date:
+            return []
+        # 각 달 1일 이후 첫 거래일 위치 (거래일이 없는 달은 다음 달과 겹치므로 제거)
+        idx = self._price_index
+        positions = np.unique(idx.searchsorted(month_starts(start_date, end_date), side='left'))
+        dates = idx[positions[positions < len(idx)]]
+        return [start_date] + list(dates[dates <= end_date])
+        
+    def _calculate_transaction_fee(self, amount: float) -> float:
         """거래 수수료 계산"""
-        fee = amount * Decimal(str(self.TRANSACTION_FEE_RATE))
-        return max(Decimal(str(self.MIN_TRANSACTION_FEE)), fee)
+        return max(self.MIN_TRANSACTION_FEE, amount * self.TRANSACTION_FEE_RATE)
         
-    def _calculate_dividend_tax(self, dividend_amount: Decimal) -> Decimal:
+    def _calculate_dividend_tax(self, dividend_amount: float) -> float:
         """배당금 세금 계산"""
-        return dividend_amount * Decimal(str(self.DIVIDEND_TAX_RATE))
+        return dividend_amount * self.DIVIDEND_TAX_RATE
         
-    def _get_max_purchasable_shares(self, date: pd.Timestamp, available_cash: Decimal, price: Decimal) -> Decimal:
-        """거래량 제한을 고려한 최대 구매 가능 주식 수 계산"""
-        if 'Volume' not in self.price_data.columns:
-            return Decimal('inf')
+    def _get_max_purchasable_shares(self, pos: int, available_cash: float, price: float) -> float:
+        """거래량 제한을 고려한 최대 구매 가능 주식 수 계산 (pos: price_data의 행 위치)"""
+        if self._volume_values is None:
+            return float('inf')
             
-        daily_volume = Decimal(str(self.price_data.loc[date, 'Volume']))
-        max_volume_shares = daily_volume * Decimal(str(self.MAX_DAILY_VOLUME_RATIO))
+        daily_volume = float(self._volume_values[pos])
+        max_volume_shares = daily_volume * self.MAX_DAILY_VOLUME_RATIO
         max_cash_shares = available_cash / price
         
         return min(max_volume_shares, max_cash_shares)
         
-    def _execute_trade(self, date: pd.Timestamp, cash_amount: Decimal, trade_type: str) -> Decimal:
-        """거래 실행 (수수료 및 거래량 제한 고려)"""
-        price = Decimal(str(self.price_data.loc[date, 'Close']))
+    def _execute_trade(self, pos: int, cash_amount: float, trade_type: str) -> float:
+        """거래 실행 (수수료 및 거래량 제한 고려, pos: price_data의 행 위치)"""
+        price = float(self._close_values[pos])
         fee = self._calculate_transaction_fee(cash_amount)
         available_cash = cash_amount - fee
         
         if available_cash <= 0:
-            return Decimal('0')
+            return 0.0
             
-        max_shares = self._get_max_purchasable_shares(date, available_cash, price)
+        max_shares = self._get_max_purchasable_shares(pos, available_cash, price)
         actual_shares = min(
             max_shares,
-            (available_cash / price).quantize(Decimal('0.000001'), rounding=ROUND_HALF_UP)
+            round(available_cash / price, 6)
         )
         
         if actual_shares <= 0:
-            return Decimal('0')
+            return 0.0
             
         actual_cost = (actual_shares * price) + fee
         self.total_shares += actual_shares
         self.total_fees_paid += fee
         
         self.transactions.append({
-            'date': date,
+            'date': self._price_index[pos],
             'type': trade_type,
             'amount': float(cash_amount),
             'shares': float(actual_shares),
@@ -219,17 +325,14 @@ class InvestmentSimulator:
         # 초기 투자
         current_date = start_date
         initial_price = self._get_price_on_date(current_date)
-        initial_shares = Decimal(str(initial_investment)) / Decimal(str(initial_price))
+        initial_shares = initial_investment / initial_price
         
         # 거래 수수료 계산
-        fee = max(
-            initial_investment * self.TRANSACTION_FEE_RATE,
-            self.MIN_TRANSACTION_FEE
-        )
+        fee = self._calculate_transaction_fee(initial_investment)
         
         self.total_shares = initial_shares
-        self.total_invested = Decimal(str(initial_investment))
-        self.total_fees_paid = Decimal(str(fee))
+        self.total_invested = float(initial_investment)
+        self.total_fees_paid = float(fee)
         
         # 거래 기록 추가
         self.transactions.append({
@@ -241,67 +344,76 @@ class InvestmentSimulator:
             'fee': float(fee)
         })
         
-        # 매월 첫 거래일에 배당금 재투자
-        while current_date <= end_date:
-            # 해당 월의 배당금 계산
-            month_dividends = self._calculate_monthly_dividends(current_date)
-            
-            if month_dividends > 0:
-                # 배당세 계산
-                dividend_tax = month_dividends * Decimal(str(self.DIVIDEND_TAX_RATE))
-                net_dividends = month_dividends - dividend_tax
-                self.total_taxes_paid += dividend_tax
-                self.total_dividends_received += net_dividends
-                
-                if dividend_reinvestment and net_dividends > Decimal('5.0'):
-                    # 배당금으로 주식 추가 매수
-                    price = self._get_price_on_date(current_date)
-                    fee = max(
-                        net_dividends * Decimal(str(self.TRANSACTION_FEE_RATE)),
-                        Decimal(str(self.MIN_TRANSACTION_FEE))
-                    )
-                    
-                    if net_dividends > fee:
-                        actual_investment = net_dividends - fee
-                        actual_shares = actual_investment / Decimal(str(price))
-                        self.total_shares += actual_shares
-                        self.total_fees_paid += fee
-                        
-                        # 거래 기록 추가
-                        self.transactions.append({
-                            'date': current_date,
-                            'action': 'REINVEST',
-                            'shares': float(actual_shares),
-                            'price': float(price),
-                            'amount': float(actual_investment),
-                            'fee': float(fee)
-                        })
-            
-            # 다음 달의 첫 거래일로 이동
-            next_date = self._get_next_month_first_trading_day(current_date)
-            if next_date is None:
-                break
-            current_date = next_date
+        # 매월 첫 거래일의 종가와 주당 배당금을 배열로 한 번에 준비
+        schedule = self._monthly_schedule(start_date, end_date)
+        schedule_index = pd.DatetimeIndex(schedule)
+        if schedule:
+            positions = self._price_index.searchsorted(schedule_index, side='left')
+            prices = self._close_values[np.minimum(positions, len(self._close_values) - 1)]
+            month_keys = schedule_index.year.to_numpy() * 12 + schedule_index.month.to_numpy() - 1
+            dividends_per_share = np.zeros(len(schedule))
+            if len(self._dividend_month_keys):
+                found = np.minimum(self._dividend_month_keys.searchsorted(month_keys),
+                                   len(self._dividend_month_keys) - 1)
+                hit = self._dividend_month_keys[found] == month_keys
+                dividends_per_share[hit] = self._dividend_month_totals[found[hit]]
+        else:
+            prices = dividends_per_share = np.empty(0)
+        
+        # 배당세/수수료/재투자 점화식은 컴파일된 커널에서 한 번에 계산
+        (self.total_shares, total_taxes, total_net_dividends, monthly_net_dividends,
+         added_shares, invested, fees) = _reinvest_kernel(
+            prices.astype(np.float64), dividends_per_share, float(self.total_shares),
+            self.TRANSACTION_FEE_RATE, self.MIN_TRANSACTION_FEE, self.DIVIDEND_TAX_RATE,
+            bool(dividend_reinvestment), self.MIN_REINVEST_DIVIDEND
+        )
+        self.total_taxes_paid += total_taxes
+        self.total_dividends_received += total_net_dividends
+        self.total_fees_paid += float(fees.sum())
+        
+        # 배당금을 받은 달만 골라낸 월별 세후 배당금
+        paid = monthly_net_dividends > 0
+        monthly_dividends = pd.Series(monthly_net_dividends[paid], index=schedule_index[paid])
+        
+        # 거래 기록 추가 (재투자가 일어난 달만, 배열을 tolist로 한 번에 파이썬 값으로 변환)
+        reinvested = added_shares > 0
+        self.transactions.extend(
+            {
+                'date': schedule[i],
+                'action': 'REINVEST',
+                'shares': shares,
+                'price': price,
+                'amount': amount,
+                'fee': fee
+            }
+            for i, shares, price, amount, fee in zip(
+                np.flatnonzero(reinvested).tolist(),
+                added_shares[reinvested].tolist(),
+                prices[reinvested].tolist(),
+                invested[reinvested].tolist(),
+                fees[reinvested].tolist()
+            )
+        )
         
         # 최종 결과 계산
         final_price = self._get_price_on_date(end_date)
-        final_value = self.total_shares * Decimal(str(final_price))
+        final_value = self.total_shares * final_price
         
         # 순수 자본이득 (배당금 재투자로 인한 주식 증가분 제외)
-        initial_value = initial_shares * Decimal(str(final_price))
-        pure_capital_gain = initial_value - Decimal(str(initial_investment))
-        pure_capital_gain_pct = (pure_capital_gain / Decimal(str(initial_investment))) * Decimal('100')
+        initial_value = initial_shares * final_price
+        pure_capital_gain = initial_value - initial_investment
+        pure_capital_gain_pct = (pure_capital_gain / initial_investment) * 100
         
         # 배당금 재투자로 인한 추가 자본이득
         reinvestment_gain = final_value - initial_value
-        total_gain = final_value - Decimal(str(initial_investment))
+        total_gain = final_value - initial_investment
         
         # 연환산 수익률 계산
-        annualized_return = 0
+        annualized_return = 0.0
         duration_days = (end_date - start_date).days
         if duration_days > 0 and initial_investment > 0:
-            duration_years = Decimal(duration_days) / Decimal('365.25')
-            annualized_return = (float(final_value) / float(initial_investment)) ** (1 / float(duration_years)) - 1
+            # (최종가치 / 투자금) ^ (1 / 보유 연수), 지수는 365.25 / 보유 일수로 바로 계산
+            annualized_return = (final_value / initial_investment) ** (365.25 / duration_days) - 1.0
         
         return {
             'initial_investment': float(initial_investment),
@@ -314,11 +426,12 @@ class InvestmentSimulator:
             'pure_capital_gain_pct': float(pure_capital_gain_pct),
             'reinvestment_gain': float(reinvestment_gain),
             'total_gain': float(total_gain),
-            'total_gain_pct': float((total_gain / Decimal(str(initial_investment))) * Decimal('100')),
+            'total_gain_pct': float((total_gain / initial_investment) * 100),
             'total_dividends_received': float(self.total_dividends_received),
             'total_taxes_paid': float(self.total_taxes_paid),
             'total_fees_paid': float(self.total_fees_paid),
             'annualized_return_pct': annualized_return * 100,
+            'monthly_dividends': monthly_dividends,
             'transactions': self.transactions
         }
 
@@ -328,44 +441,180 @@ class StockAnalyzer:
     def __init__(self, ticker: str):
         self.ticker = ticker
         self.validator = StockDataValidator()
-        self.eastern_tz = pytz.timezone('America/New_York')
+        # (시작일, 종료일)별로 가져온 데이터 (같은 구간은 다시 요청하지 않음)
+        self._stock_data_cache = {}
+        
+    @cached_property
+    def info(self) -> Dict[str, Any]:
+        """종목 정보 (별도 HTTP 요청이라 처음 접근할 때만 가져옴)"""
+        return yf.Ticker(self.ticker, session=_get_yf_session()).info
+        
+    @classmethod
+    def batch(cls, tickers: List[str], start_date: datetime, end_date: datetime) -> Dict[str, 'StockAnalyzer']:
+        """여러 종목을 yf.download 한 번으로 받아서 데이터가 채워진 StockAnalyzer들을 반환
+        
+        배당금은 같은 응답의 Dividends 컬럼(actions=True)에서 꺼냅니다.
+        받은 데이터는 종목별 디스크 캐시에도 저장합니다.
+        데이터를 받지 못한 종목은 run_simulation에서 개별 요청으로 다시 시도합니다.
+        """
+        analyzers = {ticker: cls(ticker) for ticker in tickers}
+        if not tickers:
+            return analyzers
+        
+        first = analyzers[tickers[0]]
+        start_date_et, end_date_et = first._localize_range(start_date, end_date)
+        try:
+            frames = yf.download(
+                tickers, start=start_date_et, end=end_date_et,
+                group_by='ticker', actions=True, auto_adjust=True, threads=True, progress=False,
+                session=_get_yf_session()
+            )
+        except Exception as e:
+            logger.error(f"일괄 데이터 가져오기 실패: {str(e)}")
+            return analyzers
+        
+        for ticker, analyzer in analyzers.items():
+            if ticker not in frames.columns.get_level_values(0):
+                logger.warning(f"{ticker} 일괄 데이터가 없습니다.")
+                continue
+            # 다른 종목에만 있는 날짜의 행은 버리고, 배당/분할이 없는 날은 0으로 채움
+            df = frames[ticker].dropna(subset=['Open', 'High', 'Low', 'Close'])
+            df = df.fillna({'Dividends': 0.0, 'Stock Splits': 0.0}).astype(PRICE_DTYPES)
+            df.index = _to_eastern(df.index)
+            
+            dividends = df['Dividends'] if 'Dividends' in df.columns else pd.Series(dtype='float64')
+            dividends = dividends[dividends > 0]
+            
+            if not (analyzer.validator.validate_price_data(df)
+                    and analyzer.validator.validate_dividend_data(dividends)):
+                continue
+            analyzer._stock_data_cache[(start_date, end_date)] = {
+                'price_data': df,
+                'dividends': dividends
+            }
+            analyzer._save_cached(start_date, end_date, df, dividends)
+        
+        return analyzers
+        
+    def _localize_range(self, start_date: datetime, end_date: datetime):
+        """시작일 00:00, 종료일 23:59:59.999999를 뉴욕 시간으로 변환"""
+        start_date_et = pd.Timestamp(_as_date(start_date), tz=EASTERN_TZ)
+        end_date_et = pd.Timestamp(_as_date(end_date), tz=EASTERN_TZ) + pd.DateOffset(days=1) - pd.Timedelta(microseconds=1)
+        return start_date_et, end_date_et
+        
+    def _cache_paths(self):
+        """종목별 가격/배당/저장 구간 캐시 파일 경로"""
+        base = os.path.join(CACHE_DIR, self.ticker)
+        return f"{base}.parquet", f"{base}_dividends.parquet", f"{base}.json"
+        
+    def _load_cache_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        """캐시에 저장된 구간 정보 ({'start', 'end', 'fetched_at'})"""
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        
+    def _load_cached(self, start_date: datetime, end_date: datetime) -> Optional[Dict[str, Any]]:
+        """요청 구간을 모두 포함하는 디스크 캐시가 있으면 해당 구간만 잘라서 반환"""
+        price_path, dividend_path, meta_path = self._cache_paths()
+        meta = self._load_cache_meta(meta_path)
+        start, end = _as_date(start_date).isoformat(), _as_date(end_date).isoformat()
+        if not meta or meta['start'] > start or meta['end'] < end:
+            return None
+        
+        # 가져온 날 전날 이후가 포함되면 장중 데이터일 수 있으므로 만료 시간 적용
+        fetched_day = datetime.fromtimestamp(meta['fetched_at']).date()
+        if end >= (fetched_day - timedelta(days=1)).isoformat() and time.time() - meta['fetched_at'] > CACHE_TTL_SECONDS:
+            return None
+        
+        try:
+            start_date_et, end_date_et = self._localize_range(start_date, end_date)
+            price_data = pd.read_parquet(price_path, columns=PRICE_COLUMNS).loc[start_date_et:end_date_et]
+            # 종가를 float32로 저장하던 예전 캐시는 다시 받음
+            if price_data.empty or price_data['Close'].dtype != np.float64:
+                return None
+            return {
+                'price_data': price_data,
+                'dividends': pd.read_parquet(dividend_path)['Dividends']
+            }
+        except Exception as e:
+            logger.warning(f"캐시 읽기 실패 ({price_path}): {str(e)}")
+            return None
+        
+    def _save_cached(self, start_date: datetime, end_date: datetime, df: pd.DataFrame, dividends: pd.Series):
+        """가격 데이터를 기존 캐시와 병합해서 저장 (구간 정보는 마지막에 기록)"""
+        price_path, dividend_path, meta_path = self._cache_paths()
+        start, end = _as_date(start_date).isoformat(), _as_date(end_date).isoformat()
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with _cache_lock:
+                meta = self._load_cache_meta(meta_path)
+                
+                # 기존 구간과 겹치거나 이어지면 병합, 떨어져 있으면 새 구간으로 교체
+                day = timedelta(days=1)
+                stored = None
+                if (meta and os.path.exists(price_path)
+                        and start <= (datetime.fromisoformat(meta['end']) + day).date().isoformat()
+                        and end >= (datetime.fromisoformat(meta['start']) - day).date().isoformat()):
+                    stored = pd.read_parquet(price_path)
+                # 종가가 float32인 예전 캐시는 병합하지 않고 교체
+                if stored is not None and stored['Close'].dtype == np.float64:
+                    merged = pd.concat([stored, df])
+                    df = merged[~merged.index.duplicated(keep='last')].sort_index()
+                    # 배당금도 요청 구간만 받아오므로 가격과 같이 병합
+                    if os.path.exists(dividend_path):
+                        merged = pd.concat([pd.read_parquet(dividend_path)['Dividends'], dividends])
+                        dividends = merged[~merged.index.duplicated(keep='last')].sort_index()
+                    start, end = min(start, meta['start']), max(end, meta['end'])
+                
+                # 임시 파일에 쓴 뒤 교체해서 다른 프로세스가 쓰다 만 파일을 읽지 않게 함
+                _replace_file(dividend_path, lambda path: dividends.to_frame('Dividends').to_parquet(path))
+                _replace_file(price_path, df.to_parquet)
+                _replace_file(meta_path, lambda path: _write_json(path, {
+                    'start': start, 'end': end, 'fetched_at': time.time()
+                }))
+        except Exception as e:
+            logger.warning(f"캐시 저장 실패 ({price_path}): {str(e)}")
         
     def get_stock_data(self, start_date: datetime, end_date: datetime) -> Optional[Dict[str, Any]]:
         """주식 데이터를 가져오고 검증"""
+        cached = self._stock_data_cache.get((start_date, end_date))
+        if cached is None:
+            cached = self._load_cached(start_date, end_date)
+        if cached is not None:
+            self._stock_data_cache[(start_date, end_date)] = cached
+            return cached
+        
         try:
-            stock = yf.Ticker(self.ticker)
+            stock = yf.Ticker(self.ticker, session=_get_yf_session())
             
             # 날짜를 뉴욕 시간으로 변환
-            start_date_et = self.eastern_tz.localize(
-                start_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            )
-            end_date_et = self.eastern_tz.localize(
-                end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-            )
+            start_date_et, end_date_et = self._localize_range(start_date, end_date)
             
-            # 히스토리 데이터 가져오기
-            df = stock.history(start=start_date_et, end=end_date_et)
+            # 히스토리 데이터 가져오기 (배당금도 같은 응답의 Dividends 컬럼으로 받음)
+            df = stock.history(start=start_date_et, end=end_date_et, actions=True)
             
             # 데이터 검증
             if not self.validator.validate_price_data(df):
                 return None
+            df = df.astype(PRICE_DTYPES)
+            df.index = _to_eastern(df.index)
                 
-            # 배당 데이터 가져오기
-            dividends = stock.dividends
-            
-            # 배당 데이터의 시간대를 ET로 변환
-            if not dividends.empty:
-                dividends.index = dividends.index.tz_localize(None)  # 먼저 시간대 정보 제거
-                dividends.index = pd.to_datetime(dividends.index).tz_localize(self.eastern_tz)
+            # 배당 데이터 (가격 데이터와 같은 ET 인덱스를 쓰므로 따로 변환하지 않음)
+            dividends = df['Dividends'] if 'Dividends' in df.columns else pd.Series(dtype='float64')
+            dividends = dividends[dividends > 0]
             
             if not self.validator.validate_dividend_data(dividends):
                 return None
                 
-            return {
+            stock_data = {
                 'price_data': df,
-                'dividends': dividends,
-                'info': stock.info
+                'dividends': dividends
             }
+            self._stock_data_cache[(start_date, end_date)] = stock_data
+            self._save_cached(start_date, end_date, df, dividends)
+            return stock_data
             
         except Exception as e:
             logger.error(f"데이터 가져오기 실패: {str(e)}")
@@ -396,6 +645,55 @@ class StockAnalyzer:
             
         return results  # 시뮬레이터의 결과를 직접 반환
 
+def _simulate_worker(stock_data: Dict[str, Any], simulation_args: Dict[str, Any]) -> Dict[str, Any]:
+    """워커 프로세스에서 이미 가져온 데이터로 시뮬레이션만 실행"""
+    simulator = InvestmentSimulator(stock_data['price_data'], stock_data['dividends'])
+    return simulator.simulate(**simulation_args)
+
+def run_many(tickers: List[str],
+             initial_investment: float,
+             monthly_investment: float,
+             start_date: datetime,
+             end_date: datetime,
+             dividend_reinvestment: bool = True,
+             max_workers: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """여러 종목의 시뮬레이션을 프로세스 풀에서 병렬로 실행
+    
+    데이터는 부모 프로세스에서 StockAnalyzer.batch로 한 번에 가져오고(없는 종목은 개별 요청),
+    CPU를 쓰는 시뮬레이션만 워커 프로세스로 나눠서 실행합니다.
+    
+    Returns:
+        종목별 시뮬레이션 결과 (실패한 종목은 None)
+    """
+    simulation_args = {
+        'initial_investment': initial_investment,
+        'monthly_investment': monthly_investment,
+        'start_date': start_date,
+        'end_date': end_date,
+        'dividend_reinvestment': dividend_reinvestment
+    }
+    analyzers = StockAnalyzer.batch(tickers, start_date, end_date)
+    results = {}
+    
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {}
+        for ticker, analyzer in analyzers.items():
+            stock_data = analyzer.get_stock_data(start_date, end_date)
+            if not stock_data:
+                results[ticker] = None
+                continue
+            futures[executor.submit(_simulate_worker, stock_data, simulation_args)] = ticker
+        
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                logger.error(f"{ticker} 시뮬레이션 실패: {str(e)}")
+                results[ticker] = None
+    
+    return results
+
 def format_currency(amount: float) -> str:
     """통화 형식으로 포맷팅"""
     return f"${amount:,.2f}"
@@ -435,8 +733,13 @@ def print_simulation_results(results: Dict[str, Any]):
     print()
 
     print("=== 거래 내역 ===")
-    for tx in results['transactions']:
-        print(f"{tx['date'].strftime('%Y-%m-%d')} - {tx['action']}: {tx['shares']:.2f} shares @ {format_currency(tx['price'])} (수수료: {format_currency(tx['fee'])})")
+    # 거래 내역을 표 하나로 만들어서 한 번에 출력
+    tx_df = pd.DataFrame(results['transactions'], columns=['date', 'action', 'shares', 'price', 'fee'])
+    tx_df['date'] = pd.to_datetime(tx_df['date']).dt.strftime('%Y-%m-%d')
+    print(tx_df.to_string(
+        index=False,
+        formatters={'shares': '{:.2f}'.format, 'price': format_currency, 'fee': format_currency}
+    ))
 
 def main():
     parser = argparse.ArgumentParser(description='주식 투자 시뮬레이터')
@@ -5,26 +5,16 @@ import logging
 import os
 import sys
 
-# 안전한 import 처리
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-except ImportError as e:
-    st.error(f"Plotly import error: {e}")
-    st.stop()
-
+# 안전한 import 처리 (plotly는 결과 차트를 그릴 때 불러옴)
 try:
     from datetime import datetime, timedelta
-    import yfinance as yf
-    import pytz
     import numpy as np
 except ImportError as e:
     st.error(f"Required module import error: {e}")
     st.stop()
 
 try:
-    from stock_analyzer import StockAnalyzer
+    from stock_analyzer import StockAnalyzer, month_starts
 except ImportError as e:
     st.error(f"Stock analyzer import error: {e}")
     st.stop()
@@ -41,22 +31,74 @@ st.set_page_config(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 주식 데이터 가져오기 함수
-@st.cache_data(ttl=3600)  # 1시간 캐시
-def get_stock_data(ticker, start_date, end_date):
-    """주식 데이터를 가져옵니다."""
-    try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(start=start_date, end=end_date)
-        dividends = stock.dividends
-        
-        if hist.empty:
-            return None, None
-        
-        return hist, dividends
-    except Exception as e:
-        logger.error(f"Error fetching data for {ticker}: {e}")
-        return None, None
+# 인기 종목 버튼 목록 (바뀌지 않으므로 튜플)
+DIVIDEND_STOCKS = ('AAPL', 'JNJ', 'KO', 'PG', 'ABBV')
+DIVIDEND_ETFS = ('SCHD', 'VYM', 'JEPI', 'DIVO', 'HDV')
+COVERED_CALL_ETFS = ('QYLD', 'XYLD', 'RYLD', 'JEPQ', 'QYLG')
+INDIVIDUAL_COVERED_CALLS = ('TSLY', 'NVDY', 'CONY', 'GOOY', 'APLY')
+POPULAR_TICKERS = DIVIDEND_STOCKS + DIVIDEND_ETFS + COVERED_CALL_ETFS + INDIVIDUAL_COVERED_CALLS
+# 티커 -> 카테고리 설명 (목록에 없으면 사용자 입력 종목)
+TICKER_CATEGORIES = {
+    **dict.fromkeys(DIVIDEND_STOCKS, "배당주"),
+    **dict.fromkeys(DIVIDEND_ETFS, "배당 ETF"),
+    **dict.fromkeys(COVERED_CALL_ETFS, "커버드콜 ETF"),
+    **dict.fromkeys(INDIVIDUAL_COVERED_CALLS, "개별종목 커버드콜"),
+}
+
+# 미리 받아 둘 인기 종목 데이터 기간 (일)
+PREFETCH_DAYS = 5 * 365
+
+# 페이지 CSS (기본 레이아웃 + 결과 지표 폰트 크기)
+CSS = """
+<style>
+.main > div {
+    padding-top: 2rem;
+}
+.stMetric {
+    background-color: #f0f2f6;
+    border: 1px solid #ddd;
+    border-radius: 10px;
+    padding: 10px;
+    margin: 5px 0;
+}
+.stMetric > div {
+    font-size: 14px !important;
+}
+.stMetric > div > div {
+    font-size: 18px !important;
+}
+.stButton > button {
+    width: 100%;
+    height: 2.5rem;
+    border-radius: 8px;
+    font-weight: 600;
+    transition: all 0.3s ease;
+}
+.stButton > button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+div[data-testid="metric-container"] {
+    background-color: #f0f2f6;
+    border: 1px solid #d0d0d0;
+    padding: 5px;
+    border-radius: 5px;
+    margin: 5px 0;
+}
+div[data-testid="metric-container"] > div > div > div {
+    font-size: 14px !important;
+}
+div[data-testid="metric-container"] > div > div > div[data-testid="metric-value"] {
+    font-size: 18px !important;
+}
+</style>
+"""
+
+@st.cache_resource(ttl=3600)  # 디스크 캐시의 최근 구간이 만료되는 주기(1시간)마다 다시 받음
+def prefetch_popular():
+    """인기 종목 데이터를 yf.download 한 번으로 받아서 디스크 캐시를 채웁니다."""
+    end_date = datetime.now()
+    StockAnalyzer.batch(list(POPULAR_TICKERS), end_date - timedelta(days=PREFETCH_DAYS), end_date)
 
 def calculate_returns(values):
     """수익률 계산 함수"""
@@ -64,207 +106,188 @@ def calculate_returns(values):
     cum_returns = (1 + returns).cumprod() - 1
     return returns, cum_returns
 
-def simulate_investment(ticker, start_date, initial_investment, monthly_investment, reinvest_dividends=True):
-    """개선된 stock_analyzer를 사용한 투자 시뮬레이션"""
-    try:
-        # StockAnalyzer 인스턴스 생성
-        analyzer = StockAnalyzer(ticker)
-        
-        # 시뮬레이션 실행
-        results = analyzer.run_simulation(
-            initial_investment=initial_investment,
-            monthly_investment=monthly_investment,
-            start_date=start_date,
-            end_date=datetime.now(),
-            dividend_reinvestment=reinvest_dividends
-        )
-        
-        if results is None:
-            return None
-        
-        # Streamlit 앱에서 사용할 수 있는 형태로 데이터 변환
-        # 거래 내역을 기반으로 월별 데이터 생성
-        transactions = results['transactions']
-        
-        # 월별 데이터 생성
-        monthly_data = []
-        current_shares = 0
-        total_invested = 0
-        
-        for tx in transactions:
-            if tx['action'] == 'BUY':
-                current_shares += tx['shares']
-                total_invested += tx['amount']
-            elif tx['action'] == 'REINVEST':
-                current_shares += tx['shares']
-                total_invested += tx['amount']
-            
-            monthly_data.append({
-                'date': tx['date'],
-                'total_invested': total_invested,
-                'shares': current_shares,
-                'price': tx['price'],
-                'current_value': current_shares * tx['price'],
-                'capital_gains': (current_shares * tx['price']) - total_invested
-            })
-        
-        # 배당금 데이터 생성
-        dividend_data = pd.DataFrame()
-        if results['total_dividends_received'] > 0:
-            # 간단한 배당금 분배 (실제로는 더 복잡하지만 시각화용)
-            dividend_per_month = results['total_dividends_received'] / len(monthly_data)
-            for i, data in enumerate(monthly_data):
-                dividend_data = pd.concat([dividend_data, pd.DataFrame({
-                    'date': [data['date']],
-                    'dividends': [dividend_per_month]
-                })])
-        
-        return {
-            'results': pd.DataFrame(monthly_data),
-            'dividend_data': dividend_data,
-            'total_invested': results['total_invested'],
-            'final_value': results['final_value'],
-            'total_dividends_received': results['total_dividends_received'],
-            'capital_gains': results['total_gain'],
-            'capital_gain_rate': results['pure_capital_gain_pct'],
-            'dividend_yield': (results['total_dividends_received'] / results['total_invested']) * 100,
-            'total_return_pct': results['total_gain_pct'],
-            'monthly_avg_dividend': results['total_dividends_received'] / len(monthly_data) if monthly_data else 0,
-            'days_diff': (datetime.now() - start_date).days,
-            'annualized_return': results['annualized_return_pct']
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in simulation: {e}")
-        return None
-
-# CSS 스타일 추가
-def load_css():
-    st.markdown("""
-    <style>
-    .main > div {
-        padding-top: 2rem;
-    }
-    .stMetric {
-        background-color: #f0f2f6;
-        border: 1px solid #ddd;
-        border-radius: 10px;
-        padding: 10px;
-        margin: 5px 0;
-    }
-    .stMetric > div {
-        font-size: 14px !important;
-    }
-    .stMetric > div > div {
-        font-size: 18px !important;
-    }
-    .stButton > button {
-        width: 100%;
-        height: 2.5rem;
-        border-radius: 8px;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-# 메인 앱
-def main():
-    st.title("💰 What's Your Hundred K?")
-    st.markdown("**주식 투자 시뮬레이터** - 당신의 10만불이 얼마가 될 수 있을까요?")
+@st.cache_data(ttl=3600, show_spinner=False)  # 같은 입력이면 다시 계산하지 않음
+def simulate_investment(ticker, start_date, end_date, initial_investment, monthly_investment, reinvest_dividends=True):
+    """개선된 stock_analyzer를 사용한 투자 시뮬레이션
+    실패는 캐시되지 않도록 None을 반환하지 않고 예외로 알립니다 (호출하는 main()에서 처리)"""
+    # StockAnalyzer 인스턴스 생성
+    analyzer = StockAnalyzer(ticker)
     
-    # 세션 상태 초기화
-    if 'selected_stock' not in st.session_state:
-        st.session_state.selected_stock = None
-    if 'custom_ticker' not in st.session_state:
-        st.session_state.custom_ticker = ""
+    # 시뮬레이션 실행
+    results = analyzer.run_simulation(
+        initial_investment=initial_investment,
+        monthly_investment=monthly_investment,
+        start_date=start_date,
+        end_date=end_date,
+        dividend_reinvestment=reinvest_dividends
+    )
     
-    # 메인 화면에 투자 설정
-    st.header("📊 투자 설정")
+    if results is None:
+        raise ValueError(f"{ticker} 데이터를 가져올 수 없습니다")
     
-    # 종목 선택 섹션
-    st.subheader("🎯 종목 선택")
+    # Streamlit 앱에서 사용할 수 있는 형태로 데이터 변환
+    # 거래 내역의 누적합을 구한 뒤, 시작일과 매월 1일 시점의 값으로 한 번에 펼침
+    # (중간 DataFrame 없이 필요한 필드만 길이를 아는 타입 배열로 바로 채움)
+    transactions = results['transactions']
+    trade_count = len(transactions)
+    actions = np.array([t['action'] for t in transactions])
+    amounts = np.fromiter((t['amount'] for t in transactions), dtype='float64', count=trade_count)
+    trade_shares = np.fromiter((t['shares'] for t in transactions), dtype='float64', count=trade_count)
+    counted = (actions == 'BUY') | (actions == 'REINVEST')
+    cum_shares = np.cumsum(np.where(counted, trade_shares, 0.0))
+    cum_invested = np.cumsum(np.where(counted, amounts, 0.0))
+    cum_contributed = np.cumsum(np.where(actions == 'BUY', amounts, 0.0))
     
-    # 🏢 인기 배당주 (5개)
-    st.markdown("**🏢 배당주**")
-    dividend_stocks = ['AAPL', 'JNJ', 'KO', 'PG', 'ABBV']
-    cols = st.columns(5)
-    for i, ticker in enumerate(dividend_stocks):
-        with cols[i]:
-            if st.button(ticker, key=f"div_stock_{ticker}", use_container_width=True):
-                st.session_state.selected_stock = ticker
-                st.session_state.custom_ticker = ""
+    # 세후로 실제 받은 배당금의 누적합 (재투자 여부와 관계없이, 수수료 차감 전 금액)
+    monthly_dividends = results['monthly_dividends']
+    cum_received = np.concatenate(([0.0], np.cumsum(monthly_dividends.to_numpy(dtype='float64'))))
     
-    # 📈 인기 배당 ETF (5개)
-    st.markdown("**📈 배당 ETF**")
-    dividend_etfs = ['SCHD', 'VYM', 'JEPI', 'DIVO', 'HDV']
-    cols = st.columns(5)
-    for i, ticker in enumerate(dividend_etfs):
-        with cols[i]:
-            if st.button(ticker, key=f"div_etf_{ticker}", use_container_width=True):
-                st.session_state.selected_stock = ticker
-                st.session_state.custom_ticker = ""
+    # 월별 날짜: 첫 매수일과 그 다음 달부터 종료일까지 매월 1일 이후의 첫 거래일
+    # (시뮬레이터가 재투자하는 날과 같은 기준, 데이터 범위를 넘는 날짜는 마지막 거래일로 합침)
+    trade_dates = pd.DatetimeIndex([t['date'] for t in transactions])
+    first_date = trade_dates[0]
+    end_ts = pd.Timestamp(end_date, tz=first_date.tz)
+    calendar_dates = trade_dates[:1].append(month_starts(first_date, end_ts))
+    close = analyzer.get_stock_data(start_date, end_date)['price_data']['Close']
+    price_pos = np.unique(np.minimum(close.index.searchsorted(calendar_dates, side='left'), len(close) - 1))
+    month_dates = close.index[price_pos]
+    prices = close.to_numpy(dtype='float64')[price_pos]
     
-    # 🎯 인기 커버드콜 ETF (5개)
-    st.markdown("**🎯 커버드콜 ETF**")
-    covered_call_etfs = ['QYLD', 'XYLD', 'RYLD', 'JEPQ', 'QYLG']
-    cols = st.columns(5)
-    for i, ticker in enumerate(covered_call_etfs):
-        with cols[i]:
-            if st.button(ticker, key=f"cc_etf_{ticker}", use_container_width=True):
-                st.session_state.selected_stock = ticker
-                st.session_state.custom_ticker = ""
+    # 각 날짜까지의 누적 거래 값 (그날 이전 마지막 거래 위치, 첫 매수는 항상 포함)
+    last_trade = np.maximum(trade_dates.searchsorted(month_dates, side='right') - 1, 0)
+    shares = cum_shares[last_trade]
+    invested = cum_invested[last_trade]
+    contributed = cum_contributed[last_trade]
+    dividends_received = cum_received[monthly_dividends.index.searchsorted(month_dates, side='right')]
+    current_values = shares * prices
+    capital_gains = current_values - invested
     
-    # 🌟 인기 개별종목 커버드콜 (5개)
-    st.markdown("**🌟 개별종목 CC**")
-    individual_covered_calls = ['TSLY', 'NVDY', 'CONY', 'GOOY', 'APLY']
-    cols = st.columns(5)
-    for i, ticker in enumerate(individual_covered_calls):
-        with cols[i]:
-            if st.button(ticker, key=f"ind_cc_{ticker}", use_container_width=True):
-                st.session_state.selected_stock = ticker
-                st.session_state.custom_ticker = ""
+    monthly_data = pd.DataFrame({
+        'date': month_dates,
+        'total_invested': invested,
+        'shares': shares,
+        'price': prices,
+        'current_value': current_values,
+        'capital_gains': capital_gains,
+        'return_pct': np.where(invested > 0, capital_gains / invested * 100, 0.0),
+        'dividends_received': dividends_received,
+        'dividend_yield': dividends_received / contributed * 100
+    })
     
-    # 직접 티커 입력
-    st.markdown("**✍️ 직접 입력**")
-    col1, col2 = st.columns([3, 1])
+    total_dividends = results['total_dividends_received']
+    days_diff = (end_date - start_date).days
+    
+    # 배당금 데이터 생성 (시뮬레이터가 배당금을 받은 달만 골라 둔 실제 세후 금액)
+    dividend_data = pd.DataFrame({
+        'date': monthly_dividends.index,
+        'dividends': monthly_dividends.to_numpy()
+    })
+    
+    return {
+        'results': monthly_data,
+        'dividend_data': dividend_data,
+        'total_invested': results['total_invested'],
+        'final_value': results['final_value'],
+        'total_shares': results['total_shares'],
+        'avg_price': float(prices.mean()),
+        'trade_count': trade_count,
+        'total_dividends_received': total_dividends,
+        'capital_gains': results['total_gain'],
+        'capital_gain_rate': results['pure_capital_gain_pct'],
+        'dividend_yield': (total_dividends / results['total_invested']) * 100,
+        'total_return_pct': results['total_gain_pct'],
+        'monthly_avg_dividend': total_dividends / max(1, days_diff / 30),
+        'days_diff': days_diff,
+        'annualized_return': results['annualized_return_pct']
+    }
+
+# 종목 선택 영역
+def _set_selected_stock(ticker):
+    """선택 종목 지정 (처음 고른 경우에는 시뮬레이션 버튼이 보이도록 전체 화면 재실행을 예약)"""
+    if not st.session_state.selected_stock:
+        st.session_state.needs_full_rerun = True
+    st.session_state.selected_stock = ticker
+
+def _select_preset():
+    """인기 종목을 고르면 선택 종목으로 지정 (직접 입력 값은 비움)"""
+    ticker = st.session_state.preset_ticker
+    if ticker:
+        _set_selected_stock(ticker)
+        st.session_state.custom_ticker = ""
+
+def _enter_custom():
+    """직접 입력한 티커를 선택 종목으로 지정 (인기 종목 선택은 해제)"""
+    ticker = st.session_state.ticker_input.upper()
+    if ticker:
+        _set_selected_stock(ticker)
+        st.session_state.custom_ticker = ticker
+        st.session_state.preset_ticker = None
+
+@st.fragment
+def ticker_picker():
+    """종목 선택/직접 입력 영역 (선택하면 전체 앱 대신 이 영역만 다시 실행)"""
+    st.subheader("🎯 종목 선택")
+    
+    # 인기 종목 20개를 카테고리와 함께 하나의 선택 상자로 표시
+    col1, col2 = st.columns(2)
     with col1:
-        custom_input = st.text_input(
+        st.markdown("**⭐ 인기 종목**")
+        st.selectbox(
+            "인기 종목",
+            POPULAR_TICKERS,
+            index=None,
+            format_func=lambda ticker: f"[{TICKER_CATEGORIES[ticker]}] {ticker}",
+            placeholder="배당주 / 배당 ETF / 커버드콜 ETF / 개별종목 CC",
+            key="preset_ticker",
+            on_change=_select_preset,
+            label_visibility="collapsed"
+        )
+    
+    # 직접 티커 입력
+    with col2:
+        st.markdown("**✍️ 직접 입력**")
+        st.text_input(
             "티커 심볼 입력 (예: NFLX, UBER)",
             value=st.session_state.custom_ticker,
             placeholder="티커를 입력하세요...",
             key="ticker_input",
+            on_change=_enter_custom,
             label_visibility="collapsed"
         )
     
-    if custom_input and custom_input != st.session_state.custom_ticker:
-        st.session_state.custom_ticker = custom_input.upper()
-        st.session_state.selected_stock = custom_input.upper()
-    
     # 선택된 종목 표시
     if st.session_state.selected_stock:
         # 카테고리별 설명
-        stock_category = ""
-        if st.session_state.selected_stock in dividend_stocks:
-            stock_category = "배당주"
-        elif st.session_state.selected_stock in dividend_etfs:
-            stock_category = "배당 ETF"
-        elif st.session_state.selected_stock in covered_call_etfs:
-            stock_category = "커버드콜 ETF"
-        elif st.session_state.selected_stock in individual_covered_calls:
-            stock_category = "개별종목 커버드콜"
-        else:
-            stock_category = "사용자 입력 종목"
+        stock_category = TICKER_CATEGORIES.get(st.session_state.selected_stock, "사용자 입력 종목")
         
         st.success(f"✅ 선택된 종목: **{st.session_state.selected_stock}** ({stock_category})")
-        selected_stock = st.session_state.selected_stock
     else:
         st.info("👆 위에서 종목을 선택하거나 티커를 입력하세요")
-        selected_stock = None
+    
+    # 처음 종목을 고른 경우에는 시뮬레이션 버튼이 보이도록 전체 화면을 다시 실행
+    if st.session_state.pop('needs_full_rerun', False):
+        st.rerun()
+
+# 메인 앱
+def main():
+    st.markdown(CSS, unsafe_allow_html=True)
+    prefetch_popular()
+    
+    st.title("💰 What's Your Hundred K?")
+    st.markdown("**주식 투자 시뮬레이터** - 당신의 10만불이 얼마가 될 수 있을까요?")
+    
+    # 세션 상태 초기화
+    if 'selected_stock' not in st.session_state:
+        st.session_state.selected_stock = None
+    if 'custom_ticker' not in st.session_state:
+        st.session_state.custom_ticker = ""
+    
+    # 메인 화면에 투자 설정
+    st.header("📊 투자 설정")
+    
+    # 종목 선택 섹션
+    ticker_picker()
+    selected_stock = st.session_state.selected_stock
     
     st.divider()
     
@@ -328,74 +351,63 @@ def main():
             return
         
         with st.spinner(f"{selected_stock} 데이터를 분석하는 중..."):
-            results = simulate_investment(
-                selected_stock,
-                start_date,
-                initial_amount,
-                monthly_amount,
-                reinvest_dividends
-            )
+            try:
+                results = simulate_investment(
+                    selected_stock,
+                    start_date,
+                    end_date,
+                    initial_amount,
+                    monthly_amount,
+                    reinvest_dividends
+                )
+            except Exception as e:
+                # 실패한 결과는 캐시되지 않으므로 다시 시도하면 새로 계산함
+                logger.error(f"Error in simulation: {e}")
+                results = None
         
         if results is None:
             st.error("데이터를 가져올 수 없습니다. 다른 주식이나 기간을 시도해보세요.")
             return
         
+        # 차트 모듈은 결과를 그릴 때만 불러옴 (첫 화면 로딩 시간 단축)
+        try:
+            import plotly.graph_objects as go
+            from plotly.subplots import make_subplots
+        except ImportError as e:
+            st.error(f"Plotly import error: {e}")
+            return
+        
         # 결과 표시
         st.header("📈 투자 결과")
         
-        # 주요 지표 - 폰트 크기 조정을 위한 CSS 스타일 추가
-        st.markdown("""
-        <style>
-        div[data-testid="metric-container"] {
-            background-color: #f0f2f6;
-            border: 1px solid #d0d0d0;
-            padding: 5px;
-            border-radius: 5px;
-            margin: 5px 0;
-        }
-        div[data-testid="metric-container"] > div > div > div {
-            font-size: 14px !important;
-        }
-        div[data-testid="metric-container"] > div > div > div[data-testid="metric-value"] {
-            font-size: 18px !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        final_result = results['results'].iloc[-1]
-        initial_result = results['results'].iloc[0]
-        
-        # 정확한 수익률 계산
-        total_invested = final_result['total_invested']
-        final_value = final_result['final_value']
+        # 요약 지표는 simulate_investment가 계산한 값을 그대로 사용
+        monthly = results['results']
+        total_invested = results['total_invested']
+        final_value = results['final_value']
         total_dividends = results['total_dividends_received']
         
-        # 시작가와 종료가
-        start_price = initial_result['price']
-        end_price = final_result['price']
-        
         # 실제 자본 이익률 (주가 변화만)
-        capital_gain_rate = ((end_price - start_price) / start_price) * 100
+        capital_gain_rate = results['capital_gain_rate']
         
         # 실제 배당 수익률 (총 배당금 / 총 투자금)
-        dividend_yield_rate = (total_dividends / total_invested) * 100
+        dividend_yield_rate = results['dividend_yield']
         
         # 통합 수익률 (최종가치 - 총투자금) / 총투자금
-        total_return_rate = ((final_value - total_invested) / total_invested) * 100
+        total_return_rate = results['total_return_pct']
         
         col1, col2, col3, col4, col5, col6 = st.columns(6)
         
         with col1:
             st.metric(
                 "총 투자금액",
-                f"${final_result['total_invested']:,.0f}"
+                f"${total_invested:,.0f}"
             )
         
         with col2:
             st.metric(
                 "현재 가치",
-                f"${final_result['final_value']:,.0f}",
-                f"${final_result['capital_gains']:,.0f}"
+                f"${final_value:,.0f}",
+                f"${results['capital_gains']:,.0f}"
             )
         
         with col3:
@@ -419,7 +431,7 @@ def main():
         with col6:
             st.metric(
                 "보유 주식 수",
-                f"{final_result['shares']:.2f}"
+                f"{results['total_shares']:.2f}"
             )
         
         # 차트 생성 (서브플롯 - 주가차트 + 투자 성과 + 배당금 막대그래프)
@@ -432,9 +444,9 @@ def main():
         
         # 주가 차트 (첫 번째 서브플롯)
         fig.add_trace(
-            go.Scatter(
-                x=results['results']['date'],
-                y=results['results']['price'],
+            go.Scattergl(
+                x=monthly['date'],
+                y=monthly['price'],
                 mode='lines',
                 name='주가',
                 line=dict(color='red', width=2),
@@ -445,9 +457,9 @@ def main():
 
         # 투자 성과 차트 (두 번째 서브플롯)
         fig.add_trace(
-            go.Scatter(
-                x=results['results']['date'],
-                y=results['results']['total_invested'],
+            go.Scattergl(
+                x=monthly['date'],
+                y=monthly['total_invested'],
                 mode='lines',
                 name='총 투자금액',
                 line=dict(color='blue', width=2),
@@ -457,9 +469,9 @@ def main():
         )
 
         fig.add_trace(
-            go.Scatter(
-                x=results['results']['date'],
-                y=results['results']['current_value'],
+            go.Scattergl(
+                x=monthly['date'],
+                y=monthly['current_value'],
                 mode='lines',
                 name='현재 가치',
                 line=dict(color='green', width=2),
@@ -501,7 +513,8 @@ def main():
             title=chart_title,
             height=900,  # 3개 차트를 위해 높이 증가
             hovermode='x unified',
-            showlegend=True
+            showlegend=True,
+            uirevision='const'  # 확대/이동 상태를 유지해서 전체 레이아웃 재계산 방지
         )
         
         fig.update_xaxes(title_text="날짜", row=3, col=1)
@@ -517,23 +530,6 @@ def main():
         with col1:
             st.subheader("📊 투자 요약")
             
-            # 월평균 배당금 계산
-            investment_months = max(1, (end_date - start_date).days / 30)
-            monthly_avg_dividend = total_dividends / investment_months
-            
-            # 기간 계산
-            investment_days = (end_date - start_date).days
-            investment_months_count = len(results['results'])
-            
-            # 연환산 수익률
-            if investment_days > 0:
-                annualized_return = ((final_value / total_invested) ** (365 / investment_days) - 1) * 100
-            else:
-                annualized_return = 0
-            
-            # 평균 주가 계산
-            avg_price = results['results']['price'].mean()
-            
             summary_data = {
                 "항목": [
                     "투자 기간",
@@ -546,14 +542,14 @@ def main():
                     "월평균 배당금"
                 ],
                 "값": [
-                    f"{investment_days}일",
-                    f"{investment_months_count}회",
-                    f"${avg_price:.2f}",
+                    f"{results['days_diff']}일",
+                    f"{results['trade_count']}회",
+                    f"${results['avg_price']:.2f}",
                     f"{capital_gain_rate:.2f}%",
                     f"{dividend_yield_rate:.2f}%",
                     f"{total_return_rate:.2f}%",
                     f"{results['annualized_return']:.2f}%",
-                    f"${monthly_avg_dividend:.2f}"
+                    f"${results['monthly_avg_dividend']:.2f}"
                 ]
             }
             st.table(pd.DataFrame(summary_data))
@@ -561,21 +557,23 @@ def main():
         with col2:
             st.subheader("💡 투자 분석")
             
-            # 분석 메시지
+            # 분석 메시지 (여러 줄을 한 요소로 묶어서 프런트엔드로 보내는 메시지 수를 줄임)
             if total_return_rate > 0:
-                st.success(f"🎉 통합 수익률: +{total_return_rate:.2f}%")
-                st.success(f"💰 총 수익: ${final_value - total_invested:,.0f}")
+                st.success(f"🎉 통합 수익률: +{total_return_rate:.2f}%  \n"
+                           f"💰 총 수익: ${final_value - total_invested:,.0f}")
             else:
-                st.error(f"📉 통합 수익률: {total_return_rate:.2f}%")
-                st.error(f"💸 총 손실: ${final_value - total_invested:,.0f}")
+                st.error(f"📉 통합 수익률: {total_return_rate:.2f}%  \n"
+                         f"💸 총 손실: ${final_value - total_invested:,.0f}")
             
             # 수익 구성 분석
-            st.markdown("**📊 수익 구성:**")
-            st.markdown(f"- 시세차익: ${final_value - total_invested - total_dividends:,.0f} ({capital_gain_rate:.2f}%)")
-            st.markdown(f"- 배당수익: ${total_dividends:,.0f} ({dividend_yield_rate:.2f}%)")
+            st.markdown(
+                "**📊 수익 구성:**\n"
+                f"- 시세차익: ${final_value - total_invested - total_dividends:,.0f} ({capital_gain_rate:.2f}%)\n"
+                f"- 배당수익: ${total_dividends:,.0f} ({dividend_yield_rate:.2f}%)"
+            )
             
             if total_dividends > 0:
-                st.info(f"월평균 배당금: ${monthly_avg_dividend:.2f}")
+                st.info(f"월평균 배당금: ${results['monthly_avg_dividend']:.2f}")
             else:
                 st.warning("📊 이 기간 동안 배당금이 없었습니다.")
             
@@ -584,8 +582,8 @@ def main():
         
         # 상세 데이터 테이블
         with st.expander("📊 상세 데이터 보기"):
-            display_data = results['results'][['date', 'total_invested', 'current_value', 'capital_gains', 'dividend_yield']].round(2)
-            display_data.columns = ['날짜', '총 투자금', '현재 가치', '시세차익', '배당 수익률(%)']
+            display_data = monthly[['date', 'total_invested', 'current_value', 'capital_gains', 'return_pct', 'dividend_yield']].round(2)
+            display_data.columns = ['날짜', '총 투자금', '현재 가치', '시세차익', '수익률(%)', '배당 수익률(%)']
             st.dataframe(display_data, use_container_width=True)
 
 if __name__ == "__main__":